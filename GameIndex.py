@@ -1,37 +1,68 @@
 import os
 import re
 import sys
+import mmap
 import time
 import json
+import base64
 import zlib
 import shutil
 import string
 import struct
 import hashlib
+import functools
 import datetime
+import tempfile
+import threading
 import subprocess
 import unicodedata
 import configparser
+import concurrent.futures
 import xml.etree.ElementTree as ET
 from io import BytesIO
 from PIL import Image
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from colorama import Fore, Style, init
 
+# lxml parses LaunchBox XML considerably faster; stdlib is the fallback
+try:
+    from lxml import etree as XML_ET
+except ImportError:
+    XML_ET = ET
+
+# NumPy, when present, does screenshot bit-depth reduction in one pass
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# ijson, when present, streams playlist items instead of loading whole .lpl files
+try:
+    import ijson
+    try:
+        ijson = ijson.get_backend("yajl2_c")
+    except ImportError:
+        pass
+except ImportError:
+    ijson = None
+
 init()
 
 # ============================================================
 # ========================== SETUP ===========================
 # ============================================================
 
+# Folder of the script (or of the frozen exe)
+BASE_DIR = os.path.dirname(
+    sys.executable if getattr(sys, "frozen", False) else __file__
+)
+
 def resolve_scanner():
     """
     Returns (executable, scanner_path) or (None, None) if unavailable
     """
-    base = os.path.dirname(sys.executable if getattr(sys, "frozen", False) else __file__)
-
-    exe = os.path.join(base, "game_scanner.exe")
-    py  = os.path.join(base, "game_scanner.py")
+    exe = os.path.join(BASE_DIR, "game_scanner.exe")
+    py  = os.path.join(BASE_DIR, "game_scanner.py")
 
     if os.path.isfile(exe):
         return exe, None
@@ -61,39 +92,39 @@ def run_scanner_process(env=None, args=None):
     subprocess.run(cmd, env=env)
 
 
-CONFIG_FILE = "specialconfig.txt" if os.path.exists("specialconfig.txt") else "config.txt"
-
-def load_setup_minimal(path):
-    env = {}
-    if not os.path.exists(path):
-        return env
+def read_config():
+    """
+    Return (path, text) of the active config file.
+    specialconfig.txt wins over config.txt; text is None if neither exists.
+    """
+    for name in ("specialconfig.txt", "config.txt"):
+        try:
+            with open(name, "r", encoding="utf-8") as f:
+                return name, f.read()
+        except FileNotFoundError:
+            continue
+    return "config.txt", None
 
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or "=" not in line:
-                continue
+# Read once; both setup loaders work from this text
+CONFIG_FILE, CONFIG_TEXT = read_config()
 
-            key, val = line.split("=", 1)
-            key = key.strip()
-            val = val.strip()
+# KEY = "value" / KEY = 'value' lines; anything computed is left to load_setup
+_CFG_RE = re.compile(r"""^[ \t]*(\w+)[ \t]*=[ \t]*["'](.*)["'][ \t]*$""", re.M)
 
-            if val.startswith(("'", '"')) and val.endswith(("'", '"')):
-                env[key] = val[1:-1]
+def load_setup_minimal(text):
+    if not text:
+        return {}
 
-    return env
+    return dict(_CFG_RE.findall(text))
 
-def load_setup(path):
-    if not os.path.exists(path):
-        raise RuntimeError(f"Missing {path}")
+def load_setup(text):
+    if text is None:
+        raise RuntimeError(f"Missing {CONFIG_FILE}")
 
     env = {}
     safe = {"os": os}
 
-    with open(path, "r", encoding="utf-8") as f:
-        code = f.read()
-
-    exec(code, safe, env)
+    exec(text, safe, env)
     return env
 
 # ============================================================
@@ -107,6 +138,10 @@ def write_config_updates(path, updates):
     def escape(p):
         return p.replace("\\", "\\\\")
 
+    # Keep appended keys off the last line of the file
+    if lines and not lines[-1].endswith("\n"):
+        lines[-1] += "\n"
+
     for key, value in updates:
         written = False
         for i, line in enumerate(lines):
@@ -118,19 +153,21 @@ def write_config_updates(path, updates):
         if not written:
             lines.append(f'{key} = "{escape(value)}"\n')
 
+    text = "".join(lines)
     with open(path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+        f.write(text)
+
+    return text
 
 # ============================================================
 # ================== PROGRAM ROOT DETECTION ==================
 # ============================================================
 
-def locate_program_roots():
-    try:
-        import win32com.client
-    except ImportError:
-        return {}
-
+def locate_program_roots(wanted=None):
+    """
+    Find emulator / LaunchBox roots through Start Menu shortcuts.
+    wanted limits the search to those config keys (default: all).
+    """
     PROGRAMS = {
         "RETROARCH_DIR": ("RetroArch", "self"),
         "DOLPHIN_DIR":   ("Dolphin", "self"),
@@ -138,6 +175,11 @@ def locate_program_roots():
         "LAUNCHBOX_DIR": ("LaunchBox", "launchbox"),
     }
 
+    if wanted is not None:
+        PROGRAMS = {k: v for k, v in PROGRAMS.items() if k in wanted}
+        if not PROGRAMS:
+            return {}
+
     start_menu_dirs = [
         os.path.join(os.environ.get("APPDATA", ""), r"Microsoft\Windows\Start Menu\Programs"),
         os.path.join(os.environ.get("PROGRAMDATA", ""), r"Microsoft\Windows\Start Menu\Programs"),
@@ -166,38 +208,76 @@ def locate_program_roots():
 
         return exe_dir
 
-    shell = win32com.client.Dispatch("WScript.Shell")
+    def iter_lnks(base):
+        try:
+            with os.scandir(base) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from iter_lnks(entry.path)
+                    elif entry.name.lower().endswith(".lnk"):
+                        yield entry.path, entry.name.lower()
+        except OSError:
+            return
+
+    def resolve_shortcuts(lnk_paths):
+        """
+        Resolve all .lnk targets with a single PowerShell process
+        instead of one COM round trip per shortcut.
+        """
+        if not lnk_paths:
+            return {}
+
+        quoted = ",".join("'" + p.replace("'", "''") + "'" for p in lnk_paths)
+        script = (
+            "[Console]::OutputEncoding = New-Object Text.UTF8Encoding $false\n"
+            "$sh = New-Object -ComObject WScript.Shell\n"
+            f"foreach ($p in @({quoted})) {{\n"
+            "  try { $p + '|' + $sh.CreateShortcut($p).TargetPath } catch {}\n"
+            "}\n"
+        )
+        encoded = base64.b64encode(script.encode("utf-16-le")).decode("ascii")
+
+        try:
+            proc = subprocess.run(
+                ["powershell", "-NoProfile", "-NonInteractive", "-EncodedCommand", encoded],
+                capture_output=True,
+                check=False,
+            )
+        except OSError:
+            return {}
+
+        targets = {}
+        for line in proc.stdout.decode("utf-8-sig", errors="replace").splitlines():
+            lnk, sep, target = line.partition("|")
+            if sep:
+                targets[lnk.strip()] = target.strip()
+        return targets
+
+    # Walk the Start Menu once and reuse the result for every program
+    all_lnks = [lnk for base in start_menu_dirs for lnk in iter_lnks(base)]
+
+    names = [prog_name.lower() for prog_name, _ in PROGRAMS.values()]
+    targets = resolve_shortcuts([
+        lnk_path for lnk_path, lnk_name in all_lnks
+        if any(n in lnk_name for n in names)
+    ])
+
     found = {}
 
     for cfg_key, (prog_name, rule) in PROGRAMS.items():
         found[cfg_key] = None
+        prog_low = prog_name.lower()
 
-        for base in start_menu_dirs:
-            if not os.path.isdir(base):
+        for lnk_path, lnk_name in all_lnks:
+            if prog_low not in lnk_name:
                 continue
 
-            for root, _, files in os.walk(base):
-                for fname in files:
-                    if not fname.lower().endswith(".lnk"):
-                        continue
-                    if prog_name.lower() not in fname.lower():
-                        continue
-
-                    try:
-                        shortcut = shell.CreateShortCut(os.path.join(root, fname))
-                        target = shortcut.Targetpath
-                        if not target or not is_valid_exe(target, prog_name):
-                            continue
-
-                        found[cfg_key] = resolve_root(target, rule)
-                        break
-                    except Exception:
-                        continue
+            target = targets.get(lnk_path)
+            if not target or not is_valid_exe(target, prog_name):
+                continue
 
-                if found[cfg_key]:
-                    break
-            if found[cfg_key]:
-                break
+            found[cfg_key] = resolve_root(target, rule)
+            break
 
     return found
         
@@ -205,39 +285,69 @@ def locate_program_roots():
 # ======================= PATH PRECHECK ======================
 # ============================================================
 
-MIN_SETUP = load_setup_minimal(CONFIG_FILE)
+MIN_SETUP = load_setup_minimal(CONFIG_TEXT)
 
 # Emulator presence rules
 REQUIRED_EMULATORS = {
-    "RETROARCH_DIR":  ["retroarch.exe"],
-    "DOLPHIN_DIR":    ["dolphin.exe"],
-    "PCSX2_DIR":      ["pcsx2.exe"],
-    "LAUNCHBOX_DIR":  ["launchbox.exe", os.path.join("core", "launchbox.exe")],
+    "RETROARCH_DIR":  ("retroarch.exe",),
+    "DOLPHIN_DIR":    ("dolphin.exe",),
+    "PCSX2_DIR":      ("pcsx2.exe",),
+    "LAUNCHBOX_DIR":  ("launchbox.exe", os.path.join("core", "launchbox.exe")),
 }
 
+# Config keys discovered during the precheck, written back in one pass
+config_updates = []
+
+PCSX2_EXE_RE = re.compile(r"^pcsx2.*\.exe$", re.I)
+
+def find_pcsx2_exe(root):
+    """
+    Return the PCSX2 executable path relative to root, or None.
+    The last hit is cached in the config as PCSX2_EXE_REL.
+    """
+    cached = MIN_SETUP.get("PCSX2_EXE_REL")
+    if cached and os.path.isfile(os.path.join(root, cached)):
+        return cached
+
+    def scan(dirpath):
+        subdirs = []
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_file() and PCSX2_EXE_RE.match(entry.name):
+                        return entry.name, subdirs
+                    if entry.is_dir():
+                        subdirs.append(entry)
+        except OSError:
+            pass
+        return None, subdirs
+
+    # Check root
+    rel, subdirs = scan(root)
+
+    # Check one level deep (portable builds)
+    if not rel:
+        for sub in subdirs:
+            name, _ = scan(sub.path)
+            if name:
+                rel = os.path.join(sub.name, name)
+                break
+
+    if rel:
+        MIN_SETUP["PCSX2_EXE_REL"] = rel
+        config_updates.append(("PCSX2_EXE_REL", rel))
+
+    return rel
+
+# Results are stable for a session: (root, candidates) -> bool
+@functools.lru_cache(maxsize=32)
 def has_required_exe(root, candidates):
     if not root or not os.path.isdir(root):
         return False
 
     # PCSX2: name + location are not stable
-    if candidates == ["pcsx2.exe"]:
-        # Check root
-        for name in os.listdir(root):
-            low = name.lower()
-            if low.startswith("pcsx2") and low.endswith(".exe"):
-                return True
-
-        # Check one level deep (portable builds)
-        for sub in os.listdir(root):
-            subdir = os.path.join(root, sub)
-            if not os.path.isdir(subdir):
-                continue
-            for name in os.listdir(subdir):
-                low = name.lower()
-                if low.startswith("pcsx2") and low.endswith(".exe"):
-                    return True
-
-        return False
+    if "pcsx2.exe" in candidates:
+        return find_pcsx2_exe(root) is not None
 
     # Exact-match rules for other emulators
     for rel in candidates:
@@ -263,8 +373,7 @@ for key, exes in REQUIRED_EMULATORS.items():
 if missing:
     print("\nVerifying emulator paths:\n")
 
-    found = locate_program_roots()
-    updates = []
+    found = locate_program_roots(set(missing))
 
     for key in missing:
         path = found.get(key)
@@ -272,12 +381,12 @@ if missing:
 
         if has_required_exe(path, exes):
             print(f"{status_ok()} {key}: {path}")
-            updates.append((key, path))
+            config_updates.append((key, path))
         else:
             print(f"{status_xx()} {key}: NOT FOUND")
 
-    if updates:
-        write_config_updates(CONFIG_FILE, updates)
+if config_updates:
+    CONFIG_TEXT = write_config_updates(CONFIG_FILE, config_updates)
 
 def use_standalone_emulator(system):
     """
@@ -285,10 +394,10 @@ def use_standalone_emulator(system):
     or fall back to RetroArch behavior.
     """
     if system == "PS2":
-        return has_required_exe(PCSX2_DIR, ["pcsx2.exe"])
+        return has_required_exe(PCSX2_DIR, REQUIRED_EMULATORS["PCSX2_DIR"])
 
     if system in ("GC", "WII"):
-        return has_required_exe(DOLPHIN_DIR, ["dolphin.exe"])
+        return has_required_exe(DOLPHIN_DIR, REQUIRED_EMULATORS["DOLPHIN_DIR"])
 
     return False
 
@@ -296,7 +405,7 @@ def use_standalone_emulator(system):
 # ------------------------------------------------------------
 # Now load the full config safely
 # ------------------------------------------------------------
-SETUP = load_setup(CONFIG_FILE)
+SETUP = load_setup(CONFIG_TEXT)
 
 def build_platform_maps(setup):
     plats = setup.get("PLATFORMS", {})
@@ -410,6 +519,7 @@ HISTORY         = "history.txt"
 PLAYTIME_EXPORT = "playtime_export.txt"
 
 PRINT_ALL = bool(SETUP.get("PRINT_ALL", False))
+PLAYTIME_SEC = SETUP.get("PLAYTIME_SEC", True)
 
 # --- ROM directory ---
 GAMES_DIR = SETUP["GAMES_DIR"]
@@ -758,22 +868,26 @@ SYSTEMS = {
     },
 }
 
-PLATFORM_TO_SYSTEM = {plat: sys for sys, d in SYSTEMS.items() for plat in d["platforms"]}
-SYSTEM_TO_CORES = {sys: d["cores"] for sys, d in SYSTEMS.items()}
-PLATFORMS_ORDERED = [plat for d in SYSTEMS.values() for plat in d["platforms"]]
+PLATFORM_TO_SYSTEM, SYSTEM_TO_CORES, PLATFORMS_ORDERED = {}, {}, []
+
+for _sys, _d in SYSTEMS.items():
+    SYSTEM_TO_CORES[_sys] = _d["cores"]
+    for _plat in _d["platforms"]:
+        PLATFORM_TO_SYSTEM[_plat] = _sys
+        PLATFORMS_ORDERED.append(_plat)
 
 PS2_ID_PATTERN = re.compile(
     r"(?:SLES|SLPM|SLUS|SLPS|SCED|SCES|SCUS|SLKA|SCPS|SLED|SCKA|SCAJ|PCPX|PAPX|PBPX|SCCS|TCES|SCPN|TLES|PSXC|SCPM)-\d{5}",
     re.I
 )
 
-ARCADE_PLATFORMS = {
+ARCADE_PLATFORMS = frozenset({
     "FBNeo - Arcade Games",
     "Handheld Electronic Game",
     # future:
     # "MAME",
     # "FinalBurn Alpha",
-}
+})
 
 # ============================================================
 # ====================== SHARED HELPERS ======================
@@ -787,11 +901,14 @@ VALID_GAMEID_PATTERNS = [
     r"(?:SLES|SLPM|SLUS|SLPS|SCED|SCES|SCUS|SLKA|SCPS|SLED|SCKA|SCAJ|PCPX|PAPX|PBPX|SCCS|TCES|SCPN|TLES|PSXC|SCPM)-\d{5}",
 ]
 
+# All patterns fused into one alternation: a single regex call per check
+_VALID_GAMEID_RE = re.compile(
+    "|".join(f"(?:{p})" for p in VALID_GAMEID_PATTERNS),
+    re.I
+)
+
 def is_valid_gameid(gameid):
-    for pat in VALID_GAMEID_PATTERNS:
-        if re.fullmatch(pat, gameid, re.I):
-            return True
-    return False
+    return _VALID_GAMEID_RE.fullmatch(gameid) is not None
 
 def has_codeword(path):
     name = os.path.basename(path).lower()
@@ -842,6 +959,10 @@ def images_identical(src, dst):
     return h1 == h2
 
 
+_PLAYTIME_H_RE = re.compile(r'([\d\.]+)\s*h')
+_PLAYTIME_M_RE = re.compile(r'(\d+)\s*m')
+_PLAYTIME_S_RE = re.compile(r'(\d+)\s*s')
+
 def parse_seconds(value):
     # Parse playtime into seconds.
     if not value:
@@ -857,20 +978,100 @@ def parse_seconds(value):
 
     h = m = s = 0
 
-    mh = re.search(r'([\d\.]+)\s*h', v)
+    mh = _PLAYTIME_H_RE.search(v)
     if mh:
         h = int(mh.group(1).replace(".", "") or 0)
 
-    mm = re.search(r'(\d+)\s*m', v)
+    mm = _PLAYTIME_M_RE.search(v)
     if mm:
         m = int(mm.group(1))
 
-    ms = re.search(r'(\d+)\s*s', v)
+    ms = _PLAYTIME_S_RE.search(v)
     if ms:
         s = int(ms.group(1))
 
     return h * 3600 + m * 60 + s
     
+_LB_XML_CACHE = {}
+_LB_INVALID_RE = re.compile(r'[<>"/\\|?*]')
+_LB_UNDERSCORE_TABLE = str.maketrans({":": "_", "'": "_", "/": "_"})
+
+def _lb_normalize(name):
+    return _LB_INVALID_RE.sub("", name.translate(_LB_UNDERSCORE_TABLE)).strip()
+
+def iter_launchbox_games(path):
+    """
+    Stream <Game> elements from a LaunchBox platform XML.
+    Each element is cleared once the caller moves on to the next one.
+    """
+    context = XML_ET.iterparse(path, events=("start", "end"))
+    _, root = next(context)
+
+    for event, elem in context:
+        if event == "end" and elem.tag == "Game":
+            yield elem
+            elem.clear()
+            # lxml: also detach the finished siblings so memory stays flat
+            if XML_ET is not ET:
+                while elem.getprevious() is not None:
+                    del elem.getparent()[0]
+
+    # Drop the emptied <Game> shells still attached to the root
+    root.clear()
+
+def _parse_lb_platform(xmlfile):
+    """
+    Parse one platform XML into (stems, titles), cached until the file's
+    mtime changes:
+      stems:  {app_stem: LaunchBox-normalized title}, first <Game> wins,
+              a stem with an empty Title maps to None
+      titles: {app_stem: raw Title}, only games with both fields set
+    """
+    path = os.path.join(LAUNCHBOX_DATA_DIR, xmlfile)
+
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _LB_XML_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    stems = {}
+    titles = {}
+    try:
+        for g in iter_launchbox_games(path):
+            app = g.findtext("ApplicationPath", "")
+            if not app:
+                continue
+
+            stem = os.path.splitext(os.path.basename(app))[0]
+            title = g.findtext("Title", "").strip()
+
+            # First <Game> wins, same as a linear scan
+            if stem not in stems:
+                stems[stem] = _lb_normalize(title) if title else None
+
+            app = app.strip()
+            if app and title:
+                titles[os.path.splitext(os.path.basename(app))[0]] = title
+    except Exception:
+        return None
+
+    _LB_XML_CACHE[path] = (mtime, (stems, titles))
+    return stems, titles
+
+def _load_lb_platform(xmlfile):
+    """Return {app_stem: LaunchBox-normalized title} for one platform XML."""
+    parsed = _parse_lb_platform(xmlfile)
+    return parsed[0] if parsed else None
+
+def _load_lb_titles(xmlfile):
+    """Return {app_stem: Title} for one platform XML."""
+    parsed = _parse_lb_platform(xmlfile)
+    return parsed[1] if parsed else None
+
 def make_launchbox_image_name(platform, rom_stem, ext):
     """
     Return LaunchBox-style image filename:
@@ -879,51 +1080,33 @@ def make_launchbox_image_name(platform, rom_stem, ext):
     If no LaunchBox Title exists for this ROM,
     return None (never fall back to ROM filename).
     """
-    def lb_normalize(name):
-        name = name.replace(":", "_").replace("'", "_").replace("/", "_")
-        name = re.sub(r'[<>"/\\|?*]', '', name)
-        return name.strip()
-
     lookup_platform = get_launchbox_lookup_key(platform)
     xmlfile = LAUNCHBOX_PLATFORMS.get(lookup_platform)
 
     if not xmlfile:
         return None
 
-    path = os.path.join(LAUNCHBOX_DATA_DIR, xmlfile)
-    if not os.path.exists(path):
+    stems = _load_lb_platform(xmlfile)
+    if not stems:
         return None
 
-    try:
-        tree = ET.parse(path)
-        root = tree.getroot()
-    except:
+    title = stems.get(rom_stem)
+    if title is None:
         return None
 
-    for g in root.findall("Game"):
-        app = g.findtext("ApplicationPath", "")
-        if not app:
-            continue
-
-        app_stem = os.path.splitext(os.path.basename(app))[0]
-        if app_stem != rom_stem:
-            continue
-
-        title = g.findtext("Title", "").strip()
-        if not title:
-            return None
-
-        return f"{lb_normalize(title)}-01{ext}"
+    return f"{title}-01{ext}"
 
-    return None
+_SYNC_SUFFIX_RE = re.compile(r"-\d+$", re.I)
+_SYNC_STANDARD_RE = re.compile(r"\.standard$", re.I)
 
+@functools.lru_cache(maxsize=65536)
 def normalize_for_sync(name):
 
     # Ignore -01, -02 etc at end
-    name = re.sub(r"-\d+$", "", name, flags=re.I)
+    name = _SYNC_SUFFIX_RE.sub("", name)
 
     # Ignore .standard at end
-    name = re.sub(r"\.standard$", "", name, flags=re.I)
+    name = _SYNC_STANDARD_RE.sub("", name)
 
     # Treat these as same character
     name = name.replace("/", "")
@@ -965,19 +1148,16 @@ def get_launchbox_lookup_key(platform):
 # - Matching must treat sanitized and unsanitized names as equal
 
 RETROARCH_REJECTED_CHARS = '&/\\:*?"<>|'
+_RETROARCH_SANITIZE_TABLE = str.maketrans(dict.fromkeys(RETROARCH_REJECTED_CHARS, "_"))
 
+@functools.lru_cache(maxsize=4096)
 def sanitize_rom_filename(name):
     """
     RetroArch thumbnails ONLY.
     Always replace '&' with '_'.
     """
     base, ext = os.path.splitext(name)
-    base = base.replace("&", "_")
-
-    for ch in RETROARCH_REJECTED_CHARS:
-        base = base.replace(ch, "_")
-
-    return base + ext
+    return base.translate(_RETROARCH_SANITIZE_TABLE) + ext
 
 def filenames_equivalent(a, b, *, strip_ext=True):
     if strip_ext:
@@ -989,6 +1169,10 @@ def filenames_equivalent(a, b, *, strip_ext=True):
     # Apply sync normalization first
     return normalize_for_sync(a0) == normalize_for_sync(b0)
 
+DISC_RE = re.compile(r"\b(disc|disk|cd)\s*(\d+)\b", re.I)
+DISC_REPL_RE = re.compile(r"\b((?:disc|disk|cd)\s*)\d+\b", re.I)
+_WS_RE = re.compile(r"\s+")
+
 def expand_multidisc_renames(rom_dir, old_file, new_file):
     """
     Expand Disc 1 rename across sibling discs.
@@ -1001,10 +1185,10 @@ def expand_multidisc_renames(rom_dir, old_file, new_file):
 
     def sig(name):
         n = name.lower()
-        m = re.search(r"\b(disc|disk|cd)\s*(\d+)\b", n)
+        m = DISC_RE.search(n)
         disc = int(m.group(2)) if m else None
-        base = re.sub(r"\b(disc|disk|cd)\s*\d+\b", "", n)
-        base = re.sub(r"\s+", " ", base).strip()
+        base = DISC_RE.sub("", n)
+        base = _WS_RE.sub(" ", base).strip()
         return base, disc
 
     old_base, old_disc = sig(old_file)
@@ -1017,21 +1201,25 @@ def expand_multidisc_renames(rom_dir, old_file, new_file):
         def repl(m):
             return f"{m.group(1)}{disc_num}"
 
-        return re.sub(
-            r"\b((?:disc|disk|cd)\s*)\d+\b",
-            repl,
-            template,
-            flags=re.I
-        )
+        return DISC_REPL_RE.sub(repl, template)
 
-    for fname in os.listdir(rom_dir):
-        fbase, fdisc = sig(fname)
+    with os.scandir(rom_dir) as it:
+        for entry in it:
+            fname = entry.name
 
-        if fdisc is None or fbase != old_base:
-            continue
+            # Cheap substring test before the regexes: every disc tag
+            # contains "dis" (disc/disk) or "cd"
+            low = fname.lower()
+            if "dis" not in low and "cd" not in low:
+                continue
+
+            fbase, fdisc = sig(fname)
+
+            if fdisc is None or fbase != old_base:
+                continue
 
-        new_name = replace_disc_number(new_file, fdisc)
-        jobs.append((rom_dir, fname, new_name))
+            new_name = replace_disc_number(new_file, fdisc)
+            jobs.append((rom_dir, fname, new_name))
 
     return jobs
 
@@ -1042,15 +1230,33 @@ def expand_multidisc_renames(rom_dir, old_file, new_file):
 # ---------- History ----------
 
 def show_history():
-    if not os.path.exists(HISTORY):
+    try:
+        with open(HISTORY, "r", encoding="utf-8") as f:
+            print(f.read())
+    except FileNotFoundError:
         print("(no history)")
-        return
-    with open(HISTORY, "r", encoding="utf-8") as f:
-        print(f.read())
+
+# Sidecar holding the next history index, so it isn't re-scanned each time
+HISTORY_IDX = HISTORY + ".idx"
+
+def save_history_index(index):
+    with open(HISTORY_IDX, "w", encoding="utf-8") as f:
+        f.write(str(index))
 
 def next_history_index():
-    if not os.path.exists(HISTORY):
+    try:
+        history_mtime = os.path.getmtime(HISTORY)
+    except OSError:
         return 1
+
+    # Trust the sidecar unless history.txt changed after it was written
+    try:
+        if os.path.getmtime(HISTORY_IDX) >= history_mtime:
+            with open(HISTORY_IDX, "r", encoding="utf-8") as f:
+                return int(f.read().strip())
+    except (OSError, ValueError):
+        pass
+
     nums = []
     with open(HISTORY, "r", encoding="utf-8") as f:
         for line in f:
@@ -1059,79 +1265,139 @@ def next_history_index():
                     nums.append(int(line.split(".", 1)[0]))
                 except:
                     pass
-    return max(nums) + 1 if nums else 1
+
+    index = max(nums) + 1 if nums else 1
+    save_history_index(index)
+    return index
 
 def write_history(path, old_line, new_line, index):
     with open(path, "a", encoding="utf-8") as f:
         f.write(f"{index}. {old_line} → {new_line}\n")
 
+    if path == HISTORY:
+        save_history_index(index + 1)
+
 
 # ---------- Local games ----------
 
 def load_local():
-    rows = []
-    if not os.path.exists(LOCAL_DB):
-        return rows
-    with open(LOCAL_DB, "r", encoding="utf-8") as f:
-        for line in f:
-            if "|" in line and not line.startswith("Platform"):
-                rows.append(line.rstrip("\n"))
-    return rows
+    try:
+        with open(LOCAL_DB, "r", encoding="utf-8") as f:
+            return [
+                line.rstrip("\n") for line in f
+                if "|" in line and not line.startswith("Platform")
+            ]
+    except FileNotFoundError:
+        return []
+
+_LOCAL_TITLE_CACHE = {}
+
+def load_local_titles():
+    """
+    {filename: title} from the local database, cached until the file
+    changes. Returns None if the database can't be read.
+    """
+    try:
+        st = os.stat(LOCAL_DB)
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = _LOCAL_TITLE_CACHE.get(LOCAL_DB)
+        if cached and cached[0] == stamp:
+            return cached[1]
+
+        db = {}
+        with open(LOCAL_DB, "r", encoding="utf-8") as f:
+            for line in f:
+                parts = [p.strip() for p in line.split("|")]
+                if len(parts) != 4:
+                    continue
+                # Playlists repeat titles a lot; share one string per title
+                db[parts[3]] = sys.intern(parts[1])
+    except (OSError, UnicodeDecodeError):
+        return None
+
+    _LOCAL_TITLE_CACHE[LOCAL_DB] = (stamp, db)
+    return db
 
 def save_local(rows):
     with open(LOCAL_DB, "w", encoding="utf-8") as f:
         f.write("Platform | Title | GameID | File\n")
-        for r in rows:
-            f.write(r + "\n")
+        f.writelines(r + "\n" for r in rows)
 
 
 # ---------- Playtime export ----------
 
 def load_playtime_export():
-    if not os.path.exists(PLAYTIME_EXPORT):
+    try:
+        with open(PLAYTIME_EXPORT, "r", encoding="utf-8") as f:
+            return [
+                line.rstrip("\n") for line in f
+                if "|" in line and not line.startswith("Platform")
+            ]
+    except FileNotFoundError:
         return []
-    rows = []
-    with open(PLAYTIME_EXPORT, "r", encoding="utf-8") as f:
-        for line in f:
-            if "|" in line and not line.startswith("Platform"):
-                rows.append(line.rstrip("\n"))
-    return rows
 
 def save_playtime_export(rows):
     with open(PLAYTIME_EXPORT, "w", encoding="utf-8") as f:
         f.write("Platform | Title | GameID | Playtime | Last Played | File\n")
-        for r in rows:
-            f.write(r + "\n")
+        f.writelines(r + "\n" for r in rows)
             
-def replace_lines_in_file(path, replacements):
-    if not replacements:
-        return
+def _write_via_temp(path, fill, mode="wb", **open_kw):
+    """
+    Let fill(f) write a temp file next to path, then swap it in, so a
+    crash mid-write never leaves a truncated file behind. fill()
+    returning False keeps path as it is. The temp file is gone afterwards
+    either way, also when the swap fails (target locked on Windows).
+    Returns True if path was replaced.
+    """
+    tmp = tempfile.NamedTemporaryFile(
+        mode,
+        dir=os.path.dirname(os.path.abspath(path)),
+        delete=False,
+        **open_kw,
+    )
+    swapped = False
+    try:
+        with tmp:
+            keep = fill(tmp)
+        if keep is not False:
+            os.replace(tmp.name, path)
+            swapped = True
+    finally:
+        if not swapped:
+            try:
+                os.remove(tmp.name)
+            except OSError:
+                pass
 
-    if not os.path.exists(path):
-        return
+    return swapped
 
-    with open(path, "r", encoding="utf-8") as f:
-        text = f.read()
+def write_file_atomic(path, data):
+    """
+    Write bytes to path through a temp file swapped in whole.
+    """
+    def fill(f):
+        f.write(data)
 
-    # Detect newline style
-    newline = "\r\n" if "\r\n" in text else "\n"
-    has_trailing_newline = text.endswith(("\n", "\r\n"))
+    _write_via_temp(path, fill)
 
-    lines = text.splitlines()
-    out = []
+def replace_lines_in_file(path, replacements):
+    if not replacements:
+        return
 
-    for line in lines:
-        if line in replacements:
-            out.append(replacements[line])
-        else:
-            out.append(line)
+    # Stream into a temp file next to the original, then swap it in.
+    # newline="" keeps every line's own line ending untouched.
+    try:
+        src = open(path, "r", encoding="utf-8", newline="")
+    except FileNotFoundError:
+        return
 
-    new_text = newline.join(out)
-    if has_trailing_newline:
-        new_text += newline
+    def fill(tmp):
+        for raw in src:
+            line = raw.rstrip("\r\n")
+            tmp.write(replacements.get(line, line) + raw[len(line):])
 
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(new_text)
+    with src:
+        _write_via_temp(path, fill, "w", encoding="utf-8", newline="")
 
 # ============================================================
 # ===================== PLAYTIME LOADERS =====================
@@ -1147,91 +1413,146 @@ def format_playtime(seconds):
     except:
         seconds = 0
 
-    show_seconds = SETUP.get("PLAYTIME_SEC", True)
-
-    if show_seconds:
+    if PLAYTIME_SEC:
         return f"{seconds}s"
 
-    h = seconds // 3600
-    m = (seconds % 3600) // 60
-    s = seconds % 60
-
-    # Thousands-separated hours using dot
-    h_str = f"{h:,}".replace(",", "")
-
-    return f"{h_str}h {m:02}m {s:02}s"
+    m, s = divmod(seconds, 60)
+    h, m = divmod(m, 60)
+    return f"{h}h {m:02}m {s:02}s"
 
 # ---------- RetroArch ----------
 
-def load_retroarch_playtime():
-    out = {}
-
-    logs_root = RETROARCH_LOG_DIR
-    if not os.path.isdir(logs_root):
-        return out
+# .lrtl files are tiny JSON objects; only these two fields are needed
+_LRTL_RUNTIME_RE = re.compile(rb'"runtime"\s*:\s*"([^"]*)"')
+_LRTL_LAST_RE = re.compile(rb'"last_played"\s*:\s*"([^"]*)"')
+_LRTL_HMS_RE = re.compile(rb'(\d+):(\d+):(\d+)')
 
-    # ----------------------------------
-    # Build allowed roots explicitly
-    # ----------------------------------
-    allowed_roots = []
+def _scan_lrtl(root):
+    """
+    Recursive scandir walk yielding the DirEntry of every .lrtl file.
+    Unreadable directories are skipped, same as os.walk.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
 
-    # root logs dir
-    allowed_roots.append(logs_root)
+    subdirs = []
+    with it:
+        for entry in it:
+            name = entry.name
+            # Cheap last-char test first; only then lowercase the suffix
+            if name[-1:] in "lL" and name[-5:].lower() == ".lrtl":
+                if entry.is_file():
+                    yield entry
+            elif entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+
+    for sub in subdirs:
+        yield from _scan_lrtl(sub)
+
+def _compute_retroarch_roots():
+    """
+    Log directories to scan: the logs root plus every platform and core
+    subdir, with duplicate and nested roots dropped so no subtree is
+    walked (and parsed) twice. Depends only on the config, so it is
+    computed once at import.
+    """
+    logs_root = RETROARCH_LOG_DIR
+    roots = {logs_root}
 
     for platform, system in PLATFORM_TO_SYSTEM.items():
         # platform logs
-        plat_dir = os.path.join(logs_root, platform)
-        if os.path.isdir(plat_dir):
-            allowed_roots.append(plat_dir)
+        roots.add(os.path.join(logs_root, platform))
 
         # core logs
         for core in SYSTEM_TO_CORES.get(system, []):
-            core_dir = os.path.join(logs_root, core)
-            if os.path.isdir(core_dir):
-                allowed_roots.append(core_dir)
+            roots.add(os.path.join(logs_root, core))
+
+    kept = []
+    for r in sorted({os.path.realpath(r) for r in roots}):
+        if not any(r == k or r.startswith(k + os.sep) for k in kept):
+            kept.append(r)
+    return tuple(kept)
+
+_RETROARCH_ROOTS = _compute_retroarch_roots()
+
+# {path: ((mtime_ns, size), (seconds, last_played))} for .lrtl files already read
+_LRTL_CACHE = {}
+
+def _read_lrtl(path):
+    try:
+        with open(path, "rb") as f:
+            buf = f.read()
+    except:
+        return None
+
+    rt = _LRTL_RUNTIME_RE.search(buf)
+    lp = _LRTL_LAST_RE.search(buf)
+
+    if rt and lp:
+        runtime = rt.group(1).strip()
+        last = lp.group(1).decode("utf-8", "replace").strip()
+    else:
+        # Unusual layout: fall back to a full parse
+        try:
+            data = json.loads(buf)
+        except:
+            return None
+
+        runtime = data.get("runtime", "")
+        last = data.get("last_played", "")
+        runtime = runtime.strip().encode() if isinstance(runtime, str) else b""
+        last = last.strip() if isinstance(last, str) else ""
+
+    # ---------- runtime ----------
+    seconds = 0
+    hms = _LRTL_HMS_RE.fullmatch(runtime)
+    if hms:
+        seconds = (int(hms.group(1)) * 3600
+                   + int(hms.group(2)) * 60
+                   + int(hms.group(3)))
+
+    return seconds, last
+
+def load_retroarch_playtime():
+    """
+    {rom stem: (seconds, last_played)} from RetroArch .lrtl runtime logs.
+    Logs unchanged since the previous call are not re-read.
+    """
+    out = {}
+
+    if not os.path.isdir(RETROARCH_LOG_DIR):
+        return out
 
     # ----------------------------------
     # Scan allowed roots only
     # ----------------------------------
-    for root in allowed_roots:
-        for dirpath, _, files in os.walk(root):
-            for fname in files:
-                if not fname.lower().endswith(".lrtl"):
-                    continue
-
-                path = os.path.join(dirpath, fname)
-                rom = os.path.splitext(fname)[0]
+    for root in _RETROARCH_ROOTS:
+        if not os.path.isdir(root):
+            continue
 
-                try:
-                    with open(path, "r", encoding="utf-8") as f:
-                        data = json.load(f)
-                except:
-                    continue
+        for entry in _scan_lrtl(root):
+            path = entry.path
+            rom = entry.name[:-5]  # drop the known ".lrtl" suffix
 
-                runtime = data.get("runtime", "")
-                last = data.get("last_played", "")
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
 
-                # ---------- runtime ----------
-                seconds = 0
-                if runtime:
-                    parts = runtime.split(":")
-                    if len(parts) == 3:
-                        try:
-                            h, m, s = map(int, parts)
-                            seconds = h * 3600 + m * 60 + s
-                        except:
-                            seconds = 0
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = _LRTL_CACHE.get(path)
+            if cached and cached[0] == stamp:
+                out[rom] = cached[1]
+                continue
 
-                # ---------- last_played ----------
-                if isinstance(last, str):
-                    last = last.strip()
-                else:
-                    last = ""
+            row = _read_lrtl(path)
+            if row is None:
+                continue
 
-                out[rom] = {
-                    "seconds": seconds,
-                    "last_played": last
-                }
+            _LRTL_CACHE[path] = (stamp, row)
+            out[rom] = row
 
     return out
 
@@ -1244,26 +1565,28 @@ def load_dolphin_playtime():
     if not os.path.exists(DOLPHIN_PLAYTIME):
         return data
 
+    with open(DOLPHIN_PLAYTIME, "rb") as f:
+        raw = f.read()
+
     in_block = False
-    with open(DOLPHIN_PLAYTIME, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
+    for line in raw.splitlines():
+        line = line.strip()
 
-            if line == "[TimePlayed]":
-                in_block = True
-                continue
-            if line.startswith("["):
-                in_block = False
+        if line == b"[TimePlayed]":
+            in_block = True
+            continue
+        if line.startswith(b"["):
+            in_block = False
 
-            if not in_block or "=" not in line:
-                continue
+        if not in_block or b"=" not in line:
+            continue
 
-            gameid, val = line.split("=", 1)
-            try:
-                ms = int(val.strip(), 16)
-                data[gameid.strip()] = ms // 1000
-            except:
-                pass
+        gameid, val = line.split(b"=", 1)
+        try:
+            ms = int(val, 16)
+            data[gameid.strip().decode("ascii")] = ms // 1000
+        except:
+            pass
 
     return data
 
@@ -1276,35 +1599,54 @@ def load_pcsx2_playtime():
     if not os.path.exists(PCSX2_PLAYTIME):
         return data
 
-    with open(PCSX2_PLAYTIME, "r", encoding="utf-8") as f:
-        for line in f:
-            if not line.strip():
-                continue
-
-            gameid = line[:33].strip()
-            secs   = line[33:54].strip()
-            last   = line[54:74].strip()
+    with open(PCSX2_PLAYTIME, "rb") as f:
+        buf = f.read()
+
+    # Fixed-width records: 33 id + 21 seconds + 20 timestamp + newline.
+    # Unpack them in one sweep; fall back to slicing lines if the file
+    # doesn't follow the layout exactly.
+    newline = b"\r\n" if b"\r\n" in buf else b"\n"
+    record = struct.Struct(f"33s21s20s{len(newline)}s")
+
+    rows = None
+    if len(buf) % record.size == 0:
+        rows = list(record.iter_unpack(buf))
+        if any(r[3] != newline for r in rows):
+            rows = None
+    if rows is None:
+        rows = [(l[:33], l[33:54], l[54:74], newline) for l in buf.split(newline)]
+
+    for gameid, secs, last, _ in rows:
+        gameid = gameid.strip()
+        if not gameid:
+            continue
+        gameid = gameid.decode("ascii", errors="ignore")
 
-            try:
-                secs = int(secs)
-            except:
-                secs = 0
+        try:
+            secs = int(secs)
+        except:
+            secs = 0
 
-            try:
-                last = int(last)
-                if last:
-                    last = datetime.datetime.fromtimestamp(last).isoformat(" ")
-                else:
-                    last = ""
-            except:
+        try:
+            last = int(last)
+            if last:
+                last = datetime.datetime.fromtimestamp(last).isoformat(" ")
+            else:
                 last = ""
+        except:
+            last = ""
 
-            data[gameid] = (secs, last)
+        data[gameid] = (secs, last)
 
     return data
 
 # ---------- Minecraft ----------
-  
+
+# {stats file path: [mtime, ticks]} from the previous run
+MINECRAFT_STATS_CACHE = "minecraft_stats.json"
+
+_MC_PT_RE = re.compile(rb'"minecraft:play_time"\s*:\s*(\d+)')
+
 def load_minecraft_playtime():
     root = SETUP.get("MINECRF_DIR")
     if not root:
@@ -1314,40 +1656,73 @@ def load_minecraft_playtime():
     if not os.path.isdir(saves):
         return None
 
+    try:
+        with open(MINECRAFT_STATS_CACHE, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+
+    seen = {}
     total_ticks = 0
     last_played_ts = 0
 
-    for world in os.listdir(saves):
-        stats_dir = os.path.join(saves, world, "stats")
-        if not os.path.isdir(stats_dir):
-            continue
-
-        for fname in os.listdir(stats_dir):
-            if not fname.lower().endswith(".json"):
-                continue
-
-            path = os.path.join(stats_dir, fname)
+    with os.scandir(saves) as worlds:
+        for world in worlds:
             try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except:
+                it = os.scandir(os.path.join(world.path, "stats"))
+            except OSError:
                 continue
 
-            stats = data.get("stats", {}).get("minecraft:custom", {})
-            ticks = stats.get("minecraft:play_time", 0)
+            with it:
+                for entry in it:
+                    if not entry.name.lower().endswith(".json"):
+                        continue
 
-            try:
-                total_ticks += int(ticks)
-            except:
-                pass
+                    path = entry.path
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
 
-            # Use file modification time for "last played"
-            try:
-                mtime = os.path.getmtime(path)
-                if mtime > last_played_ts:
-                    last_played_ts = mtime
-            except:
-                pass
+                    # Unchanged since last run: reuse the stored tick count
+                    cached = cache.get(path)
+                    if cached and cached[0] == mtime:
+                        ticks = cached[1]
+                    else:
+                        try:
+                            with open(path, "rb") as f:
+                                buf = f.read()
+                        except:
+                            continue
+
+                        m = _MC_PT_RE.search(buf)
+                        if m:
+                            ticks = int(m.group(1))
+                        else:
+                            try:
+                                data = json.loads(buf)
+                            except:
+                                continue
+
+                            stats = data.get("stats", {}).get("minecraft:custom", {})
+                            try:
+                                ticks = int(stats.get("minecraft:play_time", 0))
+                            except:
+                                ticks = 0
+
+                    seen[path] = [mtime, ticks]
+                    total_ticks += ticks
+
+                    # Use file modification time for "last played"
+                    if mtime > last_played_ts:
+                        last_played_ts = mtime
+
+    if seen != cache:
+        try:
+            with open(MINECRAFT_STATS_CACHE, "w", encoding="utf-8") as f:
+                json.dump(seen, f)
+        except OSError:
+            pass
 
     if total_ticks == 0:
         return None
@@ -1361,62 +1736,42 @@ def load_minecraft_playtime():
 
 # ---------- World of Warcraft ----------
 
+# At most one match per line (the first), and the spaces around "="
+# never cross a line break: the same totals as a per-line search()
+_WOW_SI_RE = re.compile(rb'(?m)^[^\n]*?\["PlayedTotal"\][^\S\r\n]*=[^\S\r\n]*(\d+)')
+_WOW_PT_RE = re.compile(rb'(?m)^[^\n]*?\][^\S\r\n]*=[^\S\r\n]*(\d+)')
+_WOW_BPT_RE = re.compile(rb'(?m)^[^\n]*?\["timePlayed"\][^\S\r\n]*=[^\S\r\n]*(\d+)')
+
+def _sum_lua_matches(path, pat):
+    """
+    Sum the integer captured by a bytes pattern over a whole .lua file.
+    The file is mapped and swept once instead of decoded line by line.
+    """
+    try:
+        with open(path, "rb") as f, \
+             mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return sum(int(m.group(1)) for m in pat.finditer(mm))
+    except:
+        return 0
+
 def load_wow_playtime(root):
     if not root or not os.path.isdir(root):
         return None
 
     totals = []
 
-    # ---------- SavedInstances.lua ----------
-    si_path = os.path.join(root, "SavedInstances.lua")
-    if os.path.exists(si_path):
-        total = 0
-        pat = re.compile(r'\["PlayedTotal"\]\s*=\s*(\d+)')
-        try:
-            with open(si_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    m = pat.search(line)
-                    if m:
-                        total += int(m.group(1))
-        except:
-            total = 0
-
-        if total > 0:
-            totals.append((total, os.path.getmtime(si_path)))
-
-    # ---------- Playtime.lua ----------
-    pt_path = os.path.join(root, "Playtime.lua")
-    if os.path.exists(pt_path):
-        total = 0
-        pat = re.compile(r'\]\s*=\s*(\d+)')
-        try:
-            with open(pt_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    m = pat.search(line)
-                    if m:
-                        total += int(m.group(1))
-        except:
-            total = 0
-
-        if total > 0:
-            totals.append((total, os.path.getmtime(pt_path)))
-
-    # ---------- Broker_PlayedTime.lua ----------
-    bpt_path = os.path.join(root, "Broker_PlayedTime.lua")
-    if os.path.exists(bpt_path):
-        total = 0
-        pat = re.compile(r'\["timePlayed"\]\s*=\s*(\d+)')
-        try:
-            with open(bpt_path, "r", encoding="utf-8") as f:
-                for line in f:
-                    m = pat.search(line)
-                    if m:
-                        total += int(m.group(1))
-        except:
-            total = 0
+    for fname, pat in (
+        ("SavedInstances.lua", _WOW_SI_RE),
+        ("Playtime.lua", _WOW_PT_RE),
+        ("Broker_PlayedTime.lua", _WOW_BPT_RE),
+    ):
+        path = os.path.join(root, fname)
+        if not os.path.exists(path):
+            continue
 
+        total = _sum_lua_matches(path, pat)
         if total > 0:
-            totals.append((total, os.path.getmtime(bpt_path)))
+            totals.append((total, os.path.getmtime(path)))
 
     if not totals:
         return None
@@ -1443,21 +1798,15 @@ def normalize_launchbox_time(s):
         s = s.replace("T", " ", 1)
     return s.strip()
 
-def load_launchbox_lastplayed():
+def _load_lb_platform_lastplayed(xml):
     data = {}
 
-    for xml in LAUNCHBOX_PLATFORMS.values():
-        path = os.path.join(LAUNCHBOX_DATA_DIR, xml)
-        if not os.path.exists(path):
-            continue
-
-        try:
-            tree = ET.parse(path)
-            root = tree.getroot()
-        except:
-            continue
+    path = os.path.join(LAUNCHBOX_DATA_DIR, xml)
+    if not os.path.exists(path):
+        return data
 
-        for g in root.findall("Game"):
+    try:
+        for g in iter_launchbox_games(path):
             app = g.findtext("ApplicationPath", "").strip()
             last = g.findtext("LastPlayedDate", "").strip()
 
@@ -1471,6 +1820,23 @@ def load_launchbox_lastplayed():
                 continue
 
             data[stem] = normalize_launchbox_time(last)
+    except:
+        pass
+
+    return data
+
+def load_launchbox_lastplayed():
+    data = {}
+
+    xmls = list(LAUNCHBOX_PLATFORMS.values())
+    if not xmls:
+        return data
+
+    # Platform files are independent; parse them side by side and
+    # merge in platform order so later platforms still win on clashes.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(xmls))) as ex:
+        for part in ex.map(_load_lb_platform_lastplayed, xmls):
+            data.update(part)
 
     return data
 
@@ -1518,12 +1884,67 @@ def write_retroarch_time(filename, seconds, lastplayed):
     if lastplayed:
         data["last_played"] = lastplayed
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    write_file_atomic(path, json.dumps(data, indent=2).encode("utf-8"))
 
 
 # ---------- LaunchBox ----------
 
+_LB_TREE_CACHE = {}
+
+def _load_lb_tree(path):
+    """
+    Parse a LaunchBox platform XML for writing.
+    The parsed tree is reused for as long as the file's mtime is unchanged,
+    so a batch of updates to one platform only parses it once.
+    """
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _LB_TREE_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    try:
+        # Always stdlib for writing: lxml serializes empty elements and the
+        # file end differently, and the XML must not depend on what's installed
+        tree = ET.parse(path)
+    except:
+        _LB_TREE_CACHE.pop(path, None)
+        return None
+
+    _LB_TREE_CACHE[path] = (mtime, tree, {})
+    return tree
+
+def _lb_game_index(path, field):
+    """
+    {lowercased field value: [(position, Game), ...]} for the cached tree.
+    ApplicationPath is keyed on its basename. Built once per tree load;
+    playtime writes never touch the indexed fields.
+    """
+    _, tree, indexes = _LB_TREE_CACHE[path]
+    index = indexes.get(field)
+    if index is None:
+        index = {}
+        basename = os.path.basename if field == "ApplicationPath" else str
+        for pos, g in enumerate(tree.getroot().iterfind("Game")):
+            value = g.findtext(field)
+            if value:
+                index.setdefault(basename(value).lower(), []).append((pos, g))
+        indexes[field] = index
+    return index
+
+def _save_lb_tree(path, tree):
+    """
+    Write a cached tree back and re-key it on the new mtime,
+    keeping it (and its indexes) valid for the next update.
+    """
+    root = tree.getroot()
+    indent_xml(root)
+    write_file_atomic(path, ET.tostring(root, encoding="utf-8", xml_declaration=True))
+    _LB_TREE_CACHE[path] = (os.path.getmtime(path), tree, _LB_TREE_CACHE[path][2])
+
 def write_launchbox_windows_time(title_candidates, seconds, lastplayed):
     """
     Write playtime / last-played to LaunchBox Windows.xml
@@ -1534,13 +1955,8 @@ def write_launchbox_windows_time(title_candidates, seconds, lastplayed):
         return
 
     path = os.path.join(LAUNCHBOX_DATA_DIR, xmlfile)
-    if not os.path.exists(path):
-        return
-
-    try:
-        tree = ET.parse(path)
-        root = tree.getroot()
-    except:
+    tree = _load_lb_tree(path)
+    if tree is None:
         return
 
     # --- normalize lastplayed ---
@@ -1559,36 +1975,31 @@ def write_launchbox_windows_time(title_candidates, seconds, lastplayed):
                 s = s.replace(" ", "T", 1)
             norm_lastplayed = s
 
-    titles_lower = [t.lower() for t in title_candidates]
-    changed = False
-
-    for g in root.findall("Game"):
-        title = g.findtext("Title", "")
-        if not title:
-            continue
-
-        if title.lower() not in titles_lower:
-            continue
+    index = _lb_game_index(path, "Title")
+    hits = [index[t][0] for t in {t.lower() for t in title_candidates} if t in index]
+    if not hits:
+        return
 
-        if seconds:
-            pt = g.find("PlayTime")
-            if pt is None:
-                pt = ET.SubElement(g, "PlayTime")
-            pt.text = str(seconds)
-            changed = True
+    # only ever update one Windows entry: the first match in the file
+    _, g = min(hits, key=lambda h: h[0])
+    changed = False
 
-        if norm_lastplayed:
-            lp = g.find("LastPlayedDate")
-            if lp is None:
-                lp = ET.SubElement(g, "LastPlayedDate")
-            lp.text = norm_lastplayed
-            changed = True
+    if seconds:
+        pt = g.find("PlayTime")
+        if pt is None:
+            pt = ET.SubElement(g, "PlayTime")
+        pt.text = str(seconds)
+        changed = True
 
-        break  # only ever update one Windows entry
+    if norm_lastplayed:
+        lp = g.find("LastPlayedDate")
+        if lp is None:
+            lp = ET.SubElement(g, "LastPlayedDate")
+        lp.text = norm_lastplayed
+        changed = True
 
     if changed:
-        indent_xml(root)
-        tree.write(path, encoding="utf-8", xml_declaration=True)
+        _save_lb_tree(path, tree)
 
 def write_launchbox_time(platform, _gameid, filename, seconds, lastplayed):
     """
@@ -1600,13 +2011,8 @@ def write_launchbox_time(platform, _gameid, filename, seconds, lastplayed):
         return
 
     path = os.path.join(LAUNCHBOX_DATA_DIR, xmlfile)
-    if not os.path.exists(path):
-        return
-
-    try:
-        tree = ET.parse(path)
-        root = tree.getroot()
-    except:
+    tree = _load_lb_tree(path)
+    if tree is None:
         return
 
     romname = os.path.basename(filename).lower()
@@ -1628,15 +2034,7 @@ def write_launchbox_time(platform, _gameid, filename, seconds, lastplayed):
                 s = s.replace(" ", "T", 1)
             norm_lastplayed = s
 
-    for g in root.findall("Game"):
-        app = g.findtext("ApplicationPath", "")
-        if not app:
-            continue
-
-        app_base = os.path.basename(app).lower()
-        if app_base != romname:
-            continue
-
+    for _, g in _lb_game_index(path, "ApplicationPath").get(romname, ()):
         if seconds:
             pt = g.find("PlayTime")
             if pt is None:
@@ -1652,8 +2050,7 @@ def write_launchbox_time(platform, _gameid, filename, seconds, lastplayed):
             changed = True
 
     if changed:
-        indent_xml(root)
-        tree.write(path, encoding="utf-8", xml_declaration=True)
+        _save_lb_tree(path, tree)
 
 # ---------- Dolphin ----------
 
@@ -1666,43 +2063,36 @@ def write_dolphin_time(gameid, seconds):
     except:
         return
 
-    hexval = "0x" + format(ms, "016x")
-
-    lines = []
-    found = False
-    in_block = False
+    with open(DOLPHIN_PLAYTIME, "rb") as f:
+        raw = f.read()
 
-    with open(DOLPHIN_PLAYTIME, "r", encoding="utf-8") as f:
-        for line in f:
-            raw = line.rstrip("\n")
+    newline = b"\r\n" if b"\r\n" in raw else b"\n"
+    new_line = f"{gameid} = 0x{ms:016x}".encode()
+    prefix = gameid.encode() + b" "
 
-            if raw.strip() == "[TimePlayed]":
-                in_block = True
-                lines.append(raw)
-                continue
+    lines = raw.split(newline)
+    if lines and not lines[-1]:
+        lines.pop()
 
-            if in_block and raw.startswith("["):
-                if not found:
-                    lines.append(f"{gameid} = {hexval}")
-                    found = True
-                in_block = False
+    in_block = False
+    block_start = -1
+    found = False
 
-            if in_block and raw.strip().startswith(gameid + " "):
-                lines.append(f"{gameid} = {hexval}")
+    for i, line in enumerate(lines):
+        if in_block:
+            if line.startswith(b"["):
+                break
+            if line.strip().startswith(prefix):
+                lines[i] = new_line
                 found = True
-            else:
-                lines.append(raw)
+        elif line.strip() == b"[TimePlayed]":
+            in_block = True
+            block_start = i
 
-    if not found:
-        out = []
-        for l in lines:
-            out.append(l)
-            if l.strip() == "[TimePlayed]":
-                out.append(f"{gameid} = {hexval}")
-        lines = out
+    if not found and block_start >= 0:
+        lines.insert(block_start + 1, new_line)
 
-    with open(DOLPHIN_PLAYTIME, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines) + "\n")
+    write_file_atomic(DOLPHIN_PLAYTIME, newline.join(lines) + newline)
 
 # ---------- PCSX2 ----------
 
@@ -1721,111 +2111,150 @@ def format_pcsx2_line(gameid, seconds, lastplayed):
     last = str(ts).ljust(20)[:20]
     return gid + secs + last
 
-def write_pcsx2_time(gameid, seconds, lastplayed):
-    if not os.path.exists(PCSX2_PLAYTIME):
-        return
+_PCSX2_STATE = None   # ((mtime_ns, size), newline, {gameid: raw line})
+_PCSX2_PENDING = {}   # {gameid: raw line} written since the last flush
 
-    with open(PCSX2_PLAYTIME, "rb") as f:
-        raw = f.read()
-
-    newline = b"\r\n" if b"\r\n" in raw else b"\n"
-    new_line = format_pcsx2_line(gameid, seconds, lastplayed).encode("ascii")
+def _load_pcsx2_state():
+    """
+    Read the PCSX2 playtime file into ((mtime_ns, size), newline, {gameid: raw line}).
+    Reused until the file changes on disk, so a batch of updates parses it
+    once; a reload re-applies the updates still pending.
+    """
+    global _PCSX2_STATE
+    st = os.stat(PCSX2_PLAYTIME)
+    stamp = (st.st_mtime_ns, st.st_size)
 
-    lines = raw.split(newline)
+    if _PCSX2_STATE is None or _PCSX2_STATE[0] != stamp:
+        with open(PCSX2_PLAYTIME, "rb") as f:
+            raw = f.read()
 
-    out = []
-    found = False
+        newline = b"\r\n" if b"\r\n" in raw else b"\n"
+        entries = {}
+        for l in raw.split(newline):
+            if l.strip():
+                entries[l[:33].decode("ascii", errors="ignore").strip()] = l
 
-    for l in lines:
-        if not l.strip():
-            continue
+        entries.update(_PCSX2_PENDING)
+        _PCSX2_STATE = (stamp, newline, entries)
+    return _PCSX2_STATE
 
-        gid = l[:33].decode("ascii", errors="ignore").strip()
+def write_pcsx2_time(gameid, seconds, lastplayed):
+    if not os.path.exists(PCSX2_PLAYTIME):
+        return
 
-        if gid == gameid:
-            out.append(new_line)
-            found = True
-        else:
-            out.append(l)
+    _, _, entries = _load_pcsx2_state()
+    new_line = format_pcsx2_line(gameid, seconds, lastplayed).encode("ascii")
 
-    if not found:
-        out.append(new_line)
+    if entries.get(gameid) != new_line:
+        entries[gameid] = new_line
+        _PCSX2_PENDING[gameid] = new_line
 
-    with open(PCSX2_PLAYTIME, "wb") as f:
-        f.write(newline.join(out) + newline)
+def flush_pcsx2():
+    """
+    Write pending write_pcsx2_time() updates back, only if something changed.
+    Always drops the cached state, even if the write fails.
+    """
+    global _PCSX2_STATE
+    try:
+        if _PCSX2_PENDING and os.path.exists(PCSX2_PLAYTIME):
+            # Merge onto the current file, not a snapshot PCSX2 may have replaced
+            _, newline, entries = _load_pcsx2_state()
+            write_file_atomic(PCSX2_PLAYTIME, newline.join(entries.values()) + newline)
+    finally:
+        _PCSX2_STATE = None
+        _PCSX2_PENDING.clear()
 
 # ============================================================
 # ============= CURATED PICTURES SHARED ENGINE ===============
 # ============================================================
 
-_LB_TITLE_CACHE = None
 
-def _resolve_filename_match(root_dir, platform, rom_stem, image_exts=None, single_ext=None, strip_suffix=True):
-    # Shared filename resolver: title first, ROM fallback
-    if not root_dir or not os.path.isdir(root_dir):
+_DIR_INDEX_CACHE = {}
+
+def _cached_dir_index(root, build, *params):
+    """
+    Memoize build(root, *params) for a flat directory listing.
+    Rebuilt whenever the directory's mtime changes (entries added,
+    removed or renamed), so it stays valid across syncs.
+    """
+    try:
+        mtime = os.stat(root).st_mtime_ns
+    except OSError:
         return None
 
-    lookup_platform = get_launchbox_lookup_key(platform)
-    lb_title = _LB_TITLE_CACHE.get((lookup_platform, rom_stem))
+    key = (root, build, params)
+    cached = _DIR_INDEX_CACHE.get(key)
+    if cached and cached[0] == mtime:
+        return cached[1]
 
-    # Title match
-    if lb_title:
-        title_norm = normalize_for_sync(lb_title)
-        for fname in os.listdir(root_dir):
-            base, ext = os.path.splitext(fname)
+    index = build(root, *params)
+    _DIR_INDEX_CACHE[key] = (mtime, index)
+    return index
+
+def _drop_dir_index(root, build, *params):
+    # Forget a memoized index so the next lookup lists the directory again
+    _DIR_INDEX_CACHE.pop((root, build, params), None)
+
+def _filename_match_index(root_dir, image_exts, single_ext, strip_suffix):
+    # {normalized base: first matching filename} in listing order
+    index = {}
+    single_ext = single_ext.lower() if single_ext else None
+
+    with os.scandir(root_dir) as it:
+        for entry in it:
+            fname = entry.name
             if image_exts:
-                if ext.lower() not in image_exts:
+                if not fname.lower().endswith(image_exts):
                     continue
             elif single_ext:
-                if ext.lower() != single_ext.lower():
+                if not fname.lower().endswith(single_ext):
                     continue
-            compare_base = re.sub(r"-\d+$", "", base) if strip_suffix else base
-            if normalize_for_sync(compare_base) == title_norm:
+            base = _split_ext(fname)[0]
+            compare_base = _SYNC_SUFFIX_RE.sub("", base) if strip_suffix else base
+            index.setdefault(normalize_for_sync(compare_base), fname)
+
+    return index
+
+def _resolve_filename_match(root_dir, platform, rom_stem, image_exts=None, single_ext=None, strip_suffix=True):
+    # Shared filename resolver: title first, ROM fallback
+    if not root_dir or not os.path.isdir(root_dir):
+        return None
+
+    params = (image_exts, single_ext, strip_suffix)
+    index = _cached_dir_index(root_dir, _filename_match_index, *params)
+    if not index:
+        return None
+
+    xmlfile = LAUNCHBOX_PLATFORMS.get(get_launchbox_lookup_key(platform))
+    titles = _load_lb_titles(xmlfile) if xmlfile else None
+    lb_title = titles.get(rom_stem) if titles else None
+
+    def lookup(index):
+        # Title match
+        if lb_title:
+            fname = index.get(normalize_for_sync(lb_title))
+            if fname:
                 return fname
 
-    # ROM fallback
-    stem_norm = normalize_for_sync(rom_stem)
-    for fname in os.listdir(root_dir):
-        base, ext = os.path.splitext(fname)
-        if image_exts:
-            if ext.lower() not in image_exts:
-                continue
-        elif single_ext:
-            if ext.lower() != single_ext.lower():
-                continue
-        compare_base = re.sub(r"-\d+$", "", base) if strip_suffix else base
-        if normalize_for_sync(compare_base) == stem_norm:
-            return fname
+        # ROM fallback
+        return index.get(normalize_for_sync(rom_stem))
 
-    return None
+    fname = lookup(index)
 
-def resolve_curated_source(src_key, platform, rom_stem, image_exts, get_lb_dir, get_ra_dir):
-    global _LB_TITLE_CACHE
+    # FAT32/exFAT don't reliably bump a folder's mtime when files change,
+    # so confirm the hit still exists and relist the folder if it doesn't
+    if fname and not os.path.isfile(os.path.join(root_dir, fname)):
+        _drop_dir_index(root_dir, _filename_match_index, *params)
+        index = _cached_dir_index(root_dir, _filename_match_index, *params)
+        fname = lookup(index) if index else None
 
+    return fname
+
+def resolve_curated_source(src_key, platform, rom_stem, image_exts, get_lb_dir, get_ra_dir):
     # Validate source key
     if src_key not in ("LB", "RA"):
         return None
 
-    # Build LB title cache once
-    if _LB_TITLE_CACHE is None:
-        _LB_TITLE_CACHE = {}
-        for plat, xmlfile in LAUNCHBOX_PLATFORMS.items():
-            path = os.path.join(LAUNCHBOX_DATA_DIR, xmlfile)
-            if not os.path.exists(path):
-                continue
-            try:
-                tree = ET.parse(path)
-                root = tree.getroot()
-            except:
-                continue
-            for g in root.findall("Game"):
-                app = g.findtext("ApplicationPath", "").strip()
-                title = g.findtext("Title", "").strip()
-                if not app or not title:
-                    continue
-                stem = os.path.splitext(os.path.basename(app))[0]
-                _LB_TITLE_CACHE[(plat, stem)] = title
-
     # Resolve source directory
     src_dir = get_lb_dir(platform) if src_key == "LB" else get_ra_dir(platform)
 
@@ -1869,10 +2298,6 @@ def resolve_curated_target(target_key, platform, rom_stem, ext, get_lb_dir, get_
 # ============================================================
 
 # ---------- Processed-screens registry helpers ----------
-BASE_DIR = os.path.dirname(
-    sys.executable if getattr(sys, "frozen", False) else __file__
-)
-
 PROC_FILE = os.path.join(BASE_DIR, "processedscreens.txt")
 
 if not os.path.exists(PROC_FILE):
@@ -1889,9 +2314,17 @@ def _normalize_ts_for_compare(ts):
     # if already full (14-digit), return as-is
     return s
 
+# The registry file is an append-only log: updates are appended as they
+# happen and the last line for a key wins. It is rewritten sorted only
+# once superseded lines make up a third of the file.
+_PROC_LOG = None       # append handle, opened on the first update
+_PROC_LOG_LINES = 0    # lines in PROC_FILE, superseded ones included
+
 def load_processed_registry():
     """Return dict mapping (platform, frontend, ident) -> ts (raw string)."""
+    global _PROC_LOG_LINES
     m = {}
+    _PROC_LOG_LINES = 0
     if not os.path.isfile(PROC_FILE):
         return m
     with open(PROC_FILE, "r", encoding="utf-8") as f:
@@ -1899,6 +2332,7 @@ def load_processed_registry():
             line = line.rstrip("\n")
             if not line or "|" not in line:
                 continue
+            _PROC_LOG_LINES += 1
             try:
                 plat, frontend, ident, ts = [x.strip() for x in line.split("|", 3)]
             except:
@@ -1909,12 +2343,23 @@ def load_processed_registry():
 
 def save_processed_registry(reg):
     """reg: dict (platform, frontend, ident) -> ts"""
+    global _PROC_LOG, _PROC_LOG_LINES
+    if _PROC_LOG is not None:
+        _PROC_LOG.close()
+        _PROC_LOG = None
+
+    # Updates are already on disk; only compact a bloated log
+    if os.path.isfile(PROC_FILE) and _PROC_LOG_LINES <= 1.5 * len(reg):
+        return
+
     # write deterministic ordering for stability
     lines = []
     for (plat, frontend, ident), ts in sorted(reg.items()):
         lines.append(f"{plat}|{frontend}|{ident}|{ts}")
-    with open(PROC_FILE, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines) + ("\n" if lines else ""))
+    write_file_atomic(
+        PROC_FILE, ("\n".join(lines) + ("\n" if lines else "")).encode("utf-8")
+    )
+    _PROC_LOG_LINES = len(lines)
 
 def should_process(reg, platform, frontend, ident, candidate_ts):
     """Return True if we should process (no entry or candidate is newer)."""
@@ -1932,17 +2377,116 @@ def should_process(reg, platform, frontend, ident, candidate_ts):
         return str(candidate_ts) > str(old_ts)
 
 def update_processed_entry(reg, platform, frontend, ident, candidate_ts):
+    global _PROC_LOG, _PROC_LOG_LINES
     reg[(platform, frontend, ident)] = candidate_ts
 
-_COMPRESSED_IMAGE_CACHE = {}
-def compress_and_copy_image(src, dst):
+    # Append right away so an interrupted sync keeps its progress
+    if _PROC_LOG is None:
+        _PROC_LOG = open(PROC_FILE, "a", encoding="utf-8")
+    _PROC_LOG.write(f"{platform}|{frontend}|{ident}|{candidate_ts}\n")
+    _PROC_LOG.flush()
+    _PROC_LOG_LINES += 1
+
+# Compressed screenshots: a small in-memory LRU in front of an on-disk
+# cache that survives between runs. Keyed on source identity + settings.
+PNG_CACHE_DIR = os.path.join(tempfile.gettempdir(), "gameindex_pngcache")
+PNG_CACHE_MAX_BYTES = 512 * 1024 * 1024
+_COMPRESSED_IMAGE_CACHE = OrderedDict()
+_COMPRESSED_IMAGE_CACHE_MAX = 64
+_COMPRESSED_IMAGE_CACHE_LOCK = threading.Lock()  # workers update it concurrently
+
+# Bit-depth reduction lookup tables: {bits: 256-byte LUT}
+_QUANT_TABLES = {
+    b: bytes((v >> (8 - b)) << (8 - b) for v in range(256))
+    for b in range(1, 8)
+}
+_IDENTITY_TABLE = bytes(range(256))
+
+# Resolved once: pngquant's presence doesn't change during a run
+PNGQUANT_PATH = "pngquant.exe"
+_PNGQUANT_EXE = shutil.which(PNGQUANT_PATH) or shutil.which("pngquant")
+
+def _remember_compressed(key, data):
+    with _COMPRESSED_IMAGE_CACHE_LOCK:
+        _COMPRESSED_IMAGE_CACHE[key] = data
+        _COMPRESSED_IMAGE_CACHE.move_to_end(key)
+        while len(_COMPRESSED_IMAGE_CACHE) > _COMPRESSED_IMAGE_CACHE_MAX:
+            _COMPRESSED_IMAGE_CACHE.popitem(last=False)
+
+def _prune_png_cache():
+    """
+    Keep the on-disk PNG cache under PNG_CACHE_MAX_BYTES, dropping the
+    least recently used files first (cache hits refresh the mtime).
+    """
+    files = []
+    try:
+        with os.scandir(PNG_CACHE_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    st = entry.stat()
+                    files.append((st.st_mtime_ns, st.st_size, entry.path))
+    except OSError:
+        return
+
+    total = sum(size for _, size, _ in files)
+    if total <= PNG_CACHE_MAX_BYTES:
+        return
+
+    files.sort()
+    for _, size, path in files:
+        if total <= PNG_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+
+def _fast_copy(src, dst, link=True):
+    """
+    Copy image data only. With link, hardlinks when src and dst share a
+    volume, otherwise (or without link) a plain data copy (no metadata).
+    """
+    # Stage next to dst and swap it in: dst is never left half-written,
+    # and an old dst that is a hardlink gets replaced, not written through
+    # Unique per thread: workers may copy to the same folder side by side
+    tmp = f"{dst}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.remove(tmp)  # leftover from an interrupted run
+    except FileNotFoundError:
+        pass
+
+    try:
+        if link:
+            try:
+                os.link(src, tmp)
+            except OSError:
+                link = False
+        if not link:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    except:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+def compress_and_copy_images(jobs, on_written=None):
+    """
+    Compress screenshots for a list of (src, dst) jobs and write them out.
+    Sources are decoded and resized in parallel, and pngquant runs once
+    per batch of images instead of once per image.
+    on_written(src, dst) is called as each target lands (from worker
+    threads, one call at a time). Returns the set of dst paths written.
+    """
 
     TARGET_WIDTH = None
     TARGET_HEIGHT = 1080
     BITS_PER_CHANNEL = 6
 
-    PNGQUANT_PATH = "pngquant.exe"
     PNGQUANT_QUALITY = "60-90"
+    PNGQUANT_BATCH = 64  # files per pngquant run (keeps command lines short)
 
     def compute_target_size(w, h):
         if TARGET_WIDTH and TARGET_HEIGHT:
@@ -1959,76 +2503,240 @@ def compress_and_copy_image(src, dst):
         if bits >= 8:
             return img
 
-        levels = 1 << bits
-        step = 256 // levels
+        levels = 1 << bits
+        step = 256 // levels
+
+        # (v // step) * step is just clearing the low bits
+        if np is not None and img.mode in ("RGBA", "RGB"):
+            mask = [0xFF ^ (step - 1)] * 3 + [0xFF] * (img.mode == "RGBA")
+            return Image.fromarray(np.asarray(img) & np.array(mask, dtype=np.uint8))
+
+        # One LUT per band, applied in a single C-level point() call
+        table = _QUANT_TABLES[bits]
+
+        if img.mode == "RGBA":
+            return img.point(table * 3 + _IDENTITY_TABLE)
+
+        if img.mode == "RGB":
+            return img.point(table * 3)
+
+        return img
+
+    def load_resized(src):
+        with Image.open(src) as img:
+            tw, th = compute_target_size(*img.size)
+
+            # JPEG: let libjpeg scale down by 1/2, 1/4 or 1/8 while decoding,
+            # never below the target size
+            if img.format == "JPEG":
+                img.draft("RGB", (tw, th))
+
+            # Only carry an alpha channel when the source has one
+            if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+                img = img.convert("RGBA")
+            else:
+                img = img.convert("RGB")
+
+            # Already at target size (e.g. 1080p captures): skip the resample
+            if (tw, th) == img.size:
+                return img
+
+            return img.resize((tw, th), Image.BICUBIC)
+
+    # A target that can't be written (locked by a frontend, no permission,
+    # disk full) is skipped; the other targets of the same image still go out
+
+    def write_dst(dst, data):
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # Swapped in whole; also never writes through a hardlinked dst
+            write_file_atomic(dst, data)
+        except OSError:
+            return
+        mark(dst)
+
+    def copy_dst(dst, cache_file):
+        try:
+            os.makedirs(os.path.dirname(dst), exist_ok=True)
+            # Copied, never linked: a cache entry must not share its data
+            # with a library image that could be edited in place
+            _fast_copy(cache_file, dst, link=False)
+        except OSError:
+            return
+        mark(dst)
+
+    def mark(dst):
+        with report_lock:
+            written.add(dst)
+            if on_written is not None:
+                on_written(owner[dst], dst)
+
+    def finish(key, dsts, final):
+        for dst in dsts:
+            write_dst(dst, final)
+
+        _remember_compressed(key, final)
+        try:
+            os.makedirs(PNG_CACHE_DIR, exist_ok=True)
+            write_file_atomic(os.path.join(PNG_CACHE_DIR, key + ".png"), final)
+        except OSError:
+            pass
+
+    def finish_file(key, dsts, path):
+        # pngquant output is already on disk: move it into the disk cache
+        # and copy from there instead of reading it back into memory
+        cache_file = os.path.join(PNG_CACHE_DIR, key + ".png")
+        try:
+            os.makedirs(PNG_CACHE_DIR, exist_ok=True)
+            os.replace(path, cache_file)
+        except OSError:
+            with open(path, "rb") as f:
+                finish(key, dsts, f.read())
+            return
+
+        for dst in dsts:
+            copy_dst(dst, cache_file)
+
+    def guarded(fn):
+        # A failing image is skipped; it must not abort the batch
+        def run(arg):
+            try:
+                return fn(arg)
+            except Exception:
+                return None
+        return run
+
+    use_pngquant = _PNGQUANT_EXE is not None
+    written = set()
+    report_lock = threading.Lock()
+
+    # One job per dst (the first wins): two workers must never race on
+    # the same target, e.g. two ROM stems that sanitize to one name
+    by_src = OrderedDict()
+    owner = {}  # dst -> src
+    for src, dst in jobs:
+        if dst in owner:
+            continue
+        owner[dst] = src
+        by_src.setdefault(src, []).append(dst)
+
+    # ---------- cached results ----------
+    todo = []
+    for src, dsts in by_src.items():
+        try:
+            st = os.stat(src)
+        except OSError:
+            continue
 
-        def q(v):
-            return min(255, (v // step) * step)
+        key = hashlib.blake2b(
+            f"{src}|{st.st_mtime_ns}|{st.st_size}|{TARGET_WIDTH}|{TARGET_HEIGHT}|"
+            # "opt" marks the optimize=True encoding, so older cache
+            # entries written at zlib level 1 are never served
+            f"{BITS_PER_CHANNEL}|{PNGQUANT_QUALITY}|{use_pngquant}|opt".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        cache_file = os.path.join(PNG_CACHE_DIR, key + ".png")
+
+        with _COMPRESSED_IMAGE_CACHE_LOCK:
+            cached = _COMPRESSED_IMAGE_CACHE.get(key)
+        if cached is not None:
+            _remember_compressed(key, cached)
+            for dst in dsts:
+                write_dst(dst, cached)
+        elif os.path.isfile(cache_file):
+            try:
+                os.utime(cache_file)  # recently used: pruned last
+            except OSError:
+                pass
+            for dst in dsts:
+                copy_dst(dst, cache_file)
+        else:
+            todo.append((src, key, dsts))
 
-        if img.mode == "RGBA":
-            r, g, b, a = img.split()
-            return Image.merge("RGBA", (r.point(q), g.point(q), b.point(q), a))
+    if not todo:
+        return written
 
-        if img.mode == "RGB":
-            r, g, b = img.split()
-            return Image.merge("RGB", (r.point(q), g.point(q), b.point(q)))
+    workers = os.cpu_count() or 4
 
-        return img
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as ex:
 
-    cached = _COMPRESSED_IMAGE_CACHE.get(src)
-    if cached is not None:
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
-        with open(dst, "wb") as f:
-            f.write(cached)
-        return True
+        if not use_pngquant:
+            def encode(job):
+                src, key, dsts = job
+                img = reduce_bit_depth(load_resized(src), BITS_PER_CHANNEL)
 
-    with Image.open(src) as img:
-        img = img.convert("RGBA")
-        tw, th = compute_target_size(*img.size)
-        img = img.resize((tw, th), Image.BICUBIC)
+                buf = BytesIO()
+                img.save(buf, format="PNG", optimize=True, compress_level=7)
+                finish(key, dsts, buf.getvalue())
 
-        buf = BytesIO()
-        img.save(buf, format="PNG")
-        data = buf.getvalue()
+            list(ex.map(guarded(encode), todo))
+            _prune_png_cache()
+            return written
 
-    if shutil.which(PNGQUANT_PATH):
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
-        with open(dst, "wb") as f:
-            f.write(data)
+        staging = tempfile.mkdtemp(prefix="gameindex_pq_")
+        try:
+            # pngquant re-encodes anyway: stage uncompressed PNGs for it
+            def stage(job):
+                src, key, dsts = job
+                load_resized(src).save(
+                    os.path.join(staging, key + ".png"), format="PNG", compress_level=0
+                )
+                return job
+
+            staged = [j for j in ex.map(guarded(stage), todo) if j]
+
+            # One pngquant run per batch; batches run side by side
+            size = max(1, min(PNGQUANT_BATCH, -(-len(staged) // workers)))
+            batches = [staged[i:i + size] for i in range(0, len(staged), size)]
+
+            def quantize(batch):
+                subprocess.run(
+                    [
+                        _PNGQUANT_EXE,
+                        "--force",
+                        "--quality", PNGQUANT_QUALITY,
+                        "--speed", "3",
+                        "--ext", "-q.png",
+                        "--",
+                    ] + [os.path.join(staging, key + ".png") for _, key, _ in batch],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False,
+                )
 
-        subprocess.run(
-            [
-                PNGQUANT_PATH,
-                "--force",
-                "--quality", PNGQUANT_QUALITY,
-                "--speed", "1",
-                "--output", dst,
-                "--", dst,
-            ],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            check=False,
-        )
+                for src, key, dsts in batch:
+                    base = os.path.join(staging, key)
+                    try:
+                        if os.path.isfile(base + "-q.png"):
+                            finish_file(key, dsts, base + "-q.png")
+                            continue
 
-        with open(dst, "rb") as f:
-            final = f.read()
-    else:
-        img = Image.open(BytesIO(data))
-        img = reduce_bit_depth(img, BITS_PER_CHANNEL)
+                        # Quality floor not reached: keep a plain PNG,
+                        # as before when pngquant left the file untouched
+                        with Image.open(base + ".png") as img:
+                            buf = BytesIO()
+                            img.save(buf, format="PNG")
 
-        buf = BytesIO()
-        img.save(buf, format="PNG", optimize=True, compress_level=7)
-        final = buf.getvalue()
+                        finish(key, dsts, buf.getvalue())
+                    except Exception:
+                        continue
 
-        os.makedirs(os.path.dirname(dst), exist_ok=True)
-        with open(dst, "wb") as f:
-            f.write(final)
+            list(ex.map(guarded(quantize), batches))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
 
-    _COMPRESSED_IMAGE_CACHE[src] = final
-    return True
+    # New entries were just added: keep the disk cache bounded
+    _prune_png_cache()
+    return written
 
 SYNC_BOTH_ACTIVE = False
 
+_SHOT_ID_STRIP_RE = re.compile(r"[_\-.]")
+_RA_SHOT_TS_RE = re.compile(r"-(\d{6})-(\d{6})$")
+_DOLPHIN_SHOT_TS_RE = re.compile(r"(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})$")
+_DIGITS_SHOT_TS_RE = re.compile(r"(\d{12,14})$")
+_COVER_ID_STRIP_RE = re.compile(r"[^A-Z0-9]")
+
 def sync_screenshots(mode, src_key):
     global SYNC_BOTH_ACTIVE
     RAW_SOURCES = {"RA_RAW", "DOLPHIN", "PCSX2", "ALL"}
@@ -2039,13 +2747,10 @@ def sync_screenshots(mode, src_key):
         return
 
     image_exts = (".png", ".jpg", ".jpeg")
-    ps2_id_pat = re.compile(VALID_GAMEID_PATTERNS[1], re.I)
-
-    def strip_lb_suffix(name):
-        return re.sub(r"-\d+$", "", name)
+    ps2_id_pat = PS2_ID_PATTERN
 
     def normalize_id(s):
-        return re.sub(r"[_\-.]", "", s.upper())
+        return _SHOT_ID_STRIP_RE.sub("", s.upper())
 
     def files_identical(a, b):
         if not os.path.isfile(a) or not os.path.isfile(b):
@@ -2073,6 +2778,15 @@ def sync_screenshots(mode, src_key):
 
     copied_paths = []
 
+    # RAW compress jobs, run after the scan: (src, dst, platform, frontend, ident, ts)
+    pending = []
+    queued = set()
+
+    # Per-sync directory indexes for the RAW sources
+    rom_file_index = {}
+    ra_shot_index = {}
+    pcsx2_shots = None
+
     # Helper: core platforms (PS2 / GC / WII)
     core_platforms = []
     core_platforms += SYSTEMS.get("PS2", {}).get("platforms", [])
@@ -2085,106 +2799,21 @@ def sync_screenshots(mode, src_key):
     # ==================================================
     # MAIN LOOP
     # ==================================================
+    # Split rows once and group them by platform, so the per-platform
+    # lookups (directories, target rules) run once per platform
+    rows_by_platform = defaultdict(list)
     for line in rows:
         try:
             platform, _, gameid, file = [x.strip() for x in line.split("|")]
         except:
             continue
+        rows_by_platform[platform].append((gameid, file))
 
-        rom_stem = os.path.splitext(os.path.basename(file))[0]
-        src = None
-
-        # --------------------------------------------------
-        # CURATED SOURCES (LaunchBox / RetroArch gameplay pics)
-        # --------------------------------------------------
-        if src_key in ("LB", "RA"):
-
-            src = resolve_curated_source(
-                src_key=src_key,
-                platform=platform,
-                rom_stem=rom_stem,
-                image_exts=image_exts,
-                get_lb_dir=get_launchbox_screen_dir,
-                get_ra_dir=get_retroarch_screen_dir,
-            )
-
-        # --------------------------------------------------
-        # RAW SOURCES (RA_RAW / DOLPHIN / PCSX2 / ALL)
-        # --------------------------------------------------
-        else:
-            best = None
-
-            # RetroArch raw screenshots (per-platform directories)
-            if src_key in ("RA_RAW", "ALL"):
-                if RETROARCH_SCREEN_DIR:
-                    rom_dir = get_games_dir(platform)
-                    rom_full_path = None
-
-                    for r, _, files in os.walk(rom_dir):
-                        if file in files:
-                            rom_full_path = os.path.join(r, file)
-                            break
-
-                    if not rom_full_path:
-                        continue  # ROM not found, skip safely
-
-                    rom_parent = os.path.basename(os.path.dirname(rom_full_path))
-
-                    root = os.path.join(RETROARCH_SCREEN_DIR, rom_parent)
-
-                    if os.path.isdir(root):
-                        for r, _, files in os.walk(root):
-                            for f in files:
-                                b, e = os.path.splitext(f)
-                                if e.lower() not in image_exts:
-                                    continue
-                                # expect form: <romstem>-XXXXXX-XXXXXX
-                                if re.sub(r"-\d{6}-\d{6}$", "", b) != rom_stem:
-                                    continue
-                                ts = re.search(r"-(\d{6})-(\d{6})$", b)
-                                if ts:
-                                    stamp = ts.group(1) + ts.group(2)   # 12-digit-ish
-                                    if not best or stamp > best[0]:
-                                        best = (stamp, os.path.join(r, f))
-
-            # Dolphin screenshots (game-specific subfolders)
-            if not best and src_key in ("DOLPHIN", "ALL"):
-                if DOLPHIN_SCREEN_DIR and gameid:
-                    root = os.path.join(DOLPHIN_SCREEN_DIR, gameid)
-                    if os.path.isdir(root):
-                        for f in os.listdir(root):
-                            base, e = os.path.splitext(f)
-                            if e.lower() not in image_exts:
-                                continue
-                            path = os.path.join(root, f)
-                            mtime = os.path.getmtime(path)
-                            if not best or mtime > best[0]:
-                                best = (mtime, path)
-
-            # PCSX2 screenshots (flat directory, filenames contain PS2 id)
-            if not best and src_key in ("PCSX2", "ALL"):
-                if PCSX2_SCREEN_DIR and os.path.isdir(PCSX2_SCREEN_DIR):
-                    for f in os.listdir(PCSX2_SCREEN_DIR):
-                        b, e = os.path.splitext(f)
-                        if e.lower() not in image_exts:
-                            continue
-                        m = ps2_id_pat.search(f)
-                        if m and normalize_id(m.group(0)) == normalize_id(gameid):
-                            path = os.path.join(PCSX2_SCREEN_DIR, f)
-                            mtime = os.path.getmtime(path)
-                            if not best or mtime > best[0]:
-                                best = (mtime, path)
-
-            if best:
-                src = best[1]
-
-        if not src:
-            continue
+    for platform, items in rows_by_platform.items():
 
-        ext = os.path.splitext(src)[1]
         targets = [mode] if mode in (1, 2) else [1, 2]
         
-        # Determine allowed targets for this game
+        # Determine allowed targets for this platform
         allowed_targets = []
 
         for t in targets:
@@ -2214,123 +2843,261 @@ def sync_screenshots(mode, src_key):
             # If we reach here, this target is allowed
             allowed_targets.append(t)
 
-        # --------------------------------------------------
-        # COPY TO TARGET(S)
-        # --------------------------------------------------
-        for t in allowed_targets:
+        if not allowed_targets:
+            continue
 
-            # ===============================
-            # CURATED SOURCES (LB / RA)
-            # ===============================
-            if src_key in ("LB", "RA"):
+        rom_dir = get_games_dir(platform)
+        lb_screen_dir = get_launchbox_screen_dir(platform)
+        ra_screen_dir = get_retroarch_screen_dir(platform)
 
-                target_key = "LB" if t == 1 else "RA"
+        for gameid, file in items:
+            rom_stem = os.path.splitext(os.path.basename(file))[0]
+            src = None
 
-                # For screenshots we block RA folder creation only when:
-                #  - source is LaunchBox -> target RetroArch (LB -> RA)
-                #  - OR source == ALL and user requested BOTH (RAW ingestion special case)
-                block_core = (src_key == "LB") or (src_key == "ALL" and is_target_both)
+            # --------------------------------------------------
+            # CURATED SOURCES (LaunchBox / RetroArch gameplay pics)
+            # --------------------------------------------------
+            if src_key in ("LB", "RA"):
 
-                tgt_root, name = resolve_curated_target(
-                    target_key=target_key,
+                src = resolve_curated_source(
+                    src_key=src_key,
                     platform=platform,
                     rom_stem=rom_stem,
-                    ext=ext,
+                    image_exts=image_exts,
                     get_lb_dir=get_launchbox_screen_dir,
                     get_ra_dir=get_retroarch_screen_dir,
-                    block_ra_core_creation=block_core,
                 )
 
-                frontend_name = "LaunchBox" if t == 1 else "RetroArch"
+            # --------------------------------------------------
+            # RAW SOURCES (RA_RAW / DOLPHIN / PCSX2 / ALL)
+            # --------------------------------------------------
+            else:
+                best = None
+
+                # RetroArch raw screenshots (per-platform directories)
+                if src_key in ("RA_RAW", "ALL"):
+                    if RETROARCH_SCREEN_DIR:
+                        # {filename: first path found} per ROM dir, walked once
+                        rom_files = rom_file_index.get(rom_dir)
+                        if rom_files is None:
+                            rom_files = {}
+                            for r, _, files in os.walk(rom_dir):
+                                for f in files:
+                                    rom_files.setdefault(f, os.path.join(r, f))
+                            rom_file_index[rom_dir] = rom_files
+
+                        rom_full_path = rom_files.get(file)
+                        if not rom_full_path:
+                            continue  # ROM not found, skip safely
+
+                        rom_parent = os.path.basename(os.path.dirname(rom_full_path))
+
+                        root = os.path.join(RETROARCH_SCREEN_DIR, rom_parent)
+
+                        # {rom stem: newest (stamp, path)} per screenshot root, walked once
+                        shots = ra_shot_index.get(root)
+                        if shots is None:
+                            shots = {}
+                            if os.path.isdir(root):
+                                for r, _, files in os.walk(root):
+                                    for f in files:
+                                        if not f.lower().endswith(image_exts):
+                                            continue
+                                        b = f[:f.rfind(".")]
+                                        # expect form: <romstem>-XXXXXX-XXXXXX
+                                        ts = _RA_SHOT_TS_RE.search(b)
+                                        if not ts:
+                                            continue
+                                        stamp = ts.group(1) + ts.group(2)   # 12-digit-ish
+                                        stem = b[:ts.start()]
+                                        prev = shots.get(stem)
+                                        if not prev or stamp > prev[0]:
+                                            shots[stem] = (stamp, os.path.join(r, f))
+                            ra_shot_index[root] = shots
+
+                        best = shots.get(rom_stem)
+
+                # Dolphin screenshots (game-specific subfolders)
+                if not best and src_key in ("DOLPHIN", "ALL"):
+                    if DOLPHIN_SCREEN_DIR and gameid:
+                        root = os.path.join(DOLPHIN_SCREEN_DIR, gameid)
+                        if os.path.isdir(root):
+                            for f in os.listdir(root):
+                                if not f.lower().endswith(image_exts):
+                                    continue
+                                path = os.path.join(root, f)
+                                mtime = os.path.getmtime(path)
+                                if not best or mtime > best[0]:
+                                    best = (mtime, path)
+
+                # PCSX2 screenshots (flat directory, filenames contain PS2 id)
+                if not best and src_key in ("PCSX2", "ALL"):
+                    if PCSX2_SCREEN_DIR and os.path.isdir(PCSX2_SCREEN_DIR):
+                        # {normalized PS2 id: [paths]}, listed once per sync
+                        if pcsx2_shots is None:
+                            pcsx2_shots = defaultdict(list)
+                            for f in os.listdir(PCSX2_SCREEN_DIR):
+                                if not f.lower().endswith(image_exts):
+                                    continue
+                                m = ps2_id_pat.search(f)
+                                if m:
+                                    pcsx2_shots[normalize_id(m.group(0))].append(
+                                        os.path.join(PCSX2_SCREEN_DIR, f)
+                                    )
 
-                if not tgt_root or not name:
-                    continue
+                        for path in pcsx2_shots.get(normalize_id(gameid), ()):
+                            mtime = os.path.getmtime(path)
+                            if not best or mtime > best[0]:
+                                best = (mtime, path)
 
-                # safe to create/ensure target folder for allowed cases
-                os.makedirs(tgt_root, exist_ok=True)
-                dst = os.path.join(tgt_root, name)
+                if best:
+                    src = best[1]
 
-                # Lossless/curated copy — preserve exact file if identical
-                if os.path.exists(dst) and files_identical(src, dst):
-                    continue
+            if not src:
+                continue
 
-                shutil.copy2(src, dst)
-                copied_paths.append(dst)
-                continue  # next target
+            ext = os.path.splitext(src)[1]
+
+            # --------------------------------------------------
+            # COPY TO TARGET(S)
+            # --------------------------------------------------
+            for t in allowed_targets:
+
+                # ===============================
+                # CURATED SOURCES (LB / RA)
+                # ===============================
+                if src_key in ("LB", "RA"):
+
+                    target_key = "LB" if t == 1 else "RA"
+
+                    # For screenshots we block RA folder creation only when:
+                    #  - source is LaunchBox -> target RetroArch (LB -> RA)
+                    #  - OR source == ALL and user requested BOTH (RAW ingestion special case)
+                    block_core = (src_key == "LB") or (src_key == "ALL" and is_target_both)
+
+                    tgt_root, name = resolve_curated_target(
+                        target_key=target_key,
+                        platform=platform,
+                        rom_stem=rom_stem,
+                        ext=ext,
+                        get_lb_dir=get_launchbox_screen_dir,
+                        get_ra_dir=get_retroarch_screen_dir,
+                        block_ra_core_creation=block_core,
+                    )
 
-            # ===============================
-            # RAW SOURCES (one-way ingestion with compression & registry)
-            # ===============================
-            else:
+                    frontend_name = "LaunchBox" if t == 1 else "RetroArch"
+
+                    if not tgt_root or not name:
+                        continue
+
+                    # safe to create/ensure target folder for allowed cases
+                    os.makedirs(tgt_root, exist_ok=True)
+                    dst = os.path.join(tgt_root, name)
 
-                if t == 1:
-                    tgt_root = get_launchbox_screen_dir(platform)
-                    name = make_launchbox_image_name(platform, rom_stem, ext)
-                    frontend_name = "LaunchBox"
+                    # Lossless/curated copy — preserve exact file if identical
+                    if os.path.exists(dst) and files_identical(src, dst):
+                        continue
+
+                    _fast_copy(src, dst)
+                    copied_paths.append(dst)
+                    continue  # next target
+
+                # ===============================
+                # RAW SOURCES (one-way ingestion with compression & registry)
+                # ===============================
                 else:
-                    tgt_root = get_retroarch_screen_dir(platform)
-                    name = sanitize_rom_filename(rom_stem) + ext
-                    frontend_name = "RetroArch"
 
-                if not name or not tgt_root:
-                    continue
+                    if t == 1:
+                        tgt_root = lb_screen_dir
+                        name = make_launchbox_image_name(platform, rom_stem, ext)
+                        frontend_name = "LaunchBox"
+                    else:
+                        tgt_root = ra_screen_dir
+                        name = sanitize_rom_filename(rom_stem) + ext
+                        frontend_name = "RetroArch"
 
-                # Extra guard: same RA core-folder rule as earlier
-                if frontend_name == "RetroArch" and platform in core_platforms:
-                    if (src_key == "ALL" and is_target_both) or (src_key == "LB"):
-                        if not os.path.isdir(tgt_root):
-                            # skip RetroArch transfer for this platform/folder
-                            continue
+                    if not name or not tgt_root:
+                        continue
 
-                os.makedirs(tgt_root, exist_ok=True)
-                dst = os.path.join(tgt_root, name)
+                    # Extra guard: same RA core-folder rule as earlier
+                    if frontend_name == "RetroArch" and platform in core_platforms:
+                        if (src_key == "ALL" and is_target_both) or (src_key == "LB"):
+                            if not os.path.isdir(tgt_root):
+                                # skip RetroArch transfer for this platform/folder
+                                continue
 
-                # Determine candidate timestamp/identity for registry
-                ident = os.path.splitext(os.path.basename(src))[0]
-                candidate_ts = ""
+                    os.makedirs(tgt_root, exist_ok=True)
+                    dst = os.path.join(tgt_root, name)
 
-                # RetroArch RAW uses <rom>-XXXXXX-XXXXXX pattern
-                m = re.search(r"-(\d{6})-(\d{6})$", ident)
-                if m:
-                    candidate_ts = m.group(1) + m.group(2)
-                else:
-                    # Dolphin ISO-like "YYYY-MM-DD_HH-MM-SS" at end
-                    m2 = re.search(r"(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})$", ident)
-                    if m2:
-                        candidate_ts = m2.group(1).replace("-", "").replace("_", "")
+                    # Determine candidate timestamp/identity for registry
+                    ident = os.path.splitext(os.path.basename(src))[0]
+                    candidate_ts = ""
+
+                    # RetroArch RAW uses <rom>-XXXXXX-XXXXXX pattern
+                    m = _RA_SHOT_TS_RE.search(ident)
+                    if m:
+                        candidate_ts = m.group(1) + m.group(2)
                     else:
-                        m3 = re.search(r"(\d{12,14})$", ident)
-                        if m3:
-                            candidate_ts = m3.group(1)
+                        # Dolphin ISO-like "YYYY-MM-DD_HH-MM-SS" at end
+                        m2 = _DOLPHIN_SHOT_TS_RE.search(ident)
+                        if m2:
+                            candidate_ts = m2.group(1).replace("-", "").replace("_", "")
                         else:
-                            # fallback: file mtime
-                            try:
-                                candidate_ts = time.strftime(
-                                    "%Y%m%d%H%M%S", time.localtime(os.path.getmtime(src))
-                                )
-                            except:
-                                candidate_ts = ""
+                            m3 = _DIGITS_SHOT_TS_RE.search(ident)
+                            if m3:
+                                candidate_ts = m3.group(1)
+                            else:
+                                # fallback: file mtime
+                                try:
+                                    candidate_ts = time.strftime(
+                                        "%Y%m%d%H%M%S", time.localtime(os.path.getmtime(src))
+                                    )
+                                except:
+                                    candidate_ts = ""
 
-                try:
-                    to_process = should_process(
-                        processed_registry, platform, frontend_name, ident, candidate_ts
-                    )
-                except Exception:
-                    to_process = True
+                    try:
+                        to_process = should_process(
+                            processed_registry, platform, frontend_name, ident, candidate_ts
+                        )
+                    except Exception:
+                        to_process = True
 
-                if not to_process:
-                    continue
+                    if not to_process:
+                        continue
 
-                try:
-                    success = compress_and_copy_image(src, dst)
-                except Exception:
-                    success = False
+                    key = (platform, frontend_name, ident)
+                    if key in queued:
+                        continue
+                    queued.add(key)
 
-                if success:
-                    copied_paths.append(dst)
-                    update_processed_entry(
-                        processed_registry, platform, frontend_name, ident, candidate_ts
-                    )
+                    pending.append((src, dst, platform, frontend_name, ident, candidate_ts))
+
+    # ==================================================
+    # Compress queued RAW screenshots in one batch
+    # ==================================================
+    if pending:
+        rows_by_job = {}
+        for job in pending:
+            rows_by_job.setdefault((job[0], job[1]), []).append(job)
+
+        landed = set()
+
+        def record(src, dst):
+            # Logged as each screenshot lands, so an interrupted sync
+            # keeps everything it already wrote
+            landed.add((src, dst))
+            for _, _, platform, frontend_name, ident, candidate_ts in rows_by_job[(src, dst)]:
+                update_processed_entry(
+                    processed_registry, platform, frontend_name, ident, candidate_ts
+                )
+
+        compress_and_copy_images(
+            [(job[0], job[1]) for job in pending], on_written=record
+        )
+
+        for src, dst, *_ in pending:
+            if (src, dst) in landed:
+                copied_paths.append(dst)
 
     # persist processed registry if we used it
     if src_key in RAW_SOURCES:
@@ -2339,8 +3106,10 @@ def sync_screenshots(mode, src_key):
         except Exception:
             pass
 
-    for p in copied_paths:
-        print(p)
+    # One console write for the whole list
+    if copied_paths:
+        sys.stdout.write("\n".join(copied_paths) + "\n")
+        sys.stdout.flush()
 
     print(f"Copied {len(copied_paths)} screenshots.")
 
@@ -2364,11 +3133,8 @@ def sync_covers(src_name, src_root, tgt_name, tgt_root):
         except:
             continue
 
-    def strip_lb_suffix(name):
-        return re.sub(r"-\d+$", "", name)
-
     def norm(s):
-        return re.sub(r"[^A-Z0-9]", "", s.upper())
+        return _COVER_ID_STRIP_RE.sub("", s.upper())
 
     grouped = defaultdict(list)
 
@@ -2398,6 +3164,7 @@ def sync_covers(src_name, src_root, tgt_name, tgt_root):
     copied = 0
     copied_paths = []
     image_exts = (".png", ".jpg", ".jpeg", ".webp")
+    id_index = {}
 
     for (platform, gameid), files in grouped.items():
         
@@ -2459,12 +3226,18 @@ def sync_covers(src_name, src_root, tgt_name, tgt_root):
         # Dolphin / PCSX2: GameID filenames (UNCHANGED)
         # --------------------------------------------------
         elif src_name in ("Dolphin", "PCSX2") and gameid:
-            gid = norm(gameid)
-            for fname in os.listdir(src_dir):
-                base, ext = os.path.splitext(fname)
-                if ext.lower() in image_exts and norm(base) == gid:
-                    src = os.path.join(src_dir, fname)
-                    break
+            # {normalized base: first matching file}, listed once per sync
+            index = id_index.get(src_dir)
+            if index is None:
+                index = {}
+                for fname in os.listdir(src_dir):
+                    if fname.lower().endswith(image_exts):
+                        index.setdefault(norm(fname[:fname.rfind(".")]), fname)
+                id_index[src_dir] = index
+
+            fname = index.get(norm(gameid))
+            if fname:
+                src = os.path.join(src_dir, fname)
 
         if not src:
             continue
@@ -2524,12 +3297,14 @@ def sync_covers(src_name, src_root, tgt_name, tgt_root):
                 continue
             # else: different image → overwrite
 
-        shutil.copy2(src, dst)
+        _fast_copy(src, dst)
         copied += 1
         copied_paths.append(dst)
         
-    for p in copied_paths:
-        print(p)
+    # One console write for the whole list
+    if copied_paths:
+        sys.stdout.write("\n".join(copied_paths) + "\n")
+        sys.stdout.flush()
 
     if tgt_name == "LaunchBox":
         print(f"Copied {copied} covers to LaunchBox cover art folder.")
@@ -2548,17 +3323,48 @@ def sync_covers(src_name, src_root, tgt_name, tgt_root):
 STEM_RE = re.compile(r"^(.*\.)[^.]+$")
 BIN_TRACK_RE = re.compile(r"^(.*?)(\s+\(Track\s+\d+\))\.bin$", re.I)
 CUE_RE = re.compile(r"^(.*)\.cue$", re.I)
+_RA_SHOT_STEM_TS_RE = re.compile(r"^(.*?)(-\d{6}-\d{6})$")
+_IMG_EXTS = frozenset((".png", ".jpg", ".jpeg"))
 
 # ---------- Stem helpers ----------
 
 def cue_base(filename):
     return filename.rsplit(".", 1)[0]
 
-def bin_base(filename):
-    m = BIN_TRACK_RE.match(filename)
-    if not m:
-        return None, None
-    return m.group(1), m.group(2)
+# ---------- Tree walk ----------
+
+def _split_ext(name):
+    # os.path.splitext for a bare file name: split at the last dot,
+    # a leading dot (".hidden") is not an extension
+    i = name.rfind(".")
+    if i <= 0:
+        return name, ""
+    return name[:i], name[i:]
+
+def _iter_files(root):
+    """
+    Iterative scandir walk yielding the DirEntry of every non-directory
+    under root, in os.walk's top-down order. Each directory is listed in
+    full before its entries are yielded, so callers may rename as they go.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir():
+                # Like os.walk: symlinked dirs are listed, not followed
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            else:
+                yield entry
+
+        stack.extend(reversed(subdirs))
 
 # ---------- Rename plans ----------
 
@@ -2579,324 +3385,471 @@ def build_rom_rename_plan(rom_dir, old_filename, new_filename):
     if oldCue:
         oldCueBase = cue_base(old_filename)
         newCueBase = cue_base(new_filename)
+        bin_match = BIN_TRACK_RE.match
+
+    # Constant across the walk
+    old_prefix = oldBase + "."
+    old_prefix_len = len(oldBase)
 
     # --------------------------------------------------
     # RECURSIVE SCAN (supports game subfolders)
+    # A flat platform folder costs one directory listing:
+    # subfolders are told apart from the listing itself
     # --------------------------------------------------
-    for dirpath, _, files in os.walk(rom_dir):
-        for fname in files:
-            src = os.path.join(dirpath, fname)
+    for entry in _iter_files(rom_dir):
+        fname = entry.name
+        src = entry.path
+        dirpath = os.path.dirname(src)
+
+        # Exact file rename (handles extension-only changes)
+        if fname == old_filename:
+            plan.append((src, os.path.join(dirpath, new_filename)))
+            continue
 
-            # Exact file rename (handles extension-only changes)
-            if fname == old_filename:
-                plan.append((src, os.path.join(dirpath, new_filename)))
-                continue
+        # Normal ROM + multi-dot save files
+        if fname.startswith(old_prefix):
+            newName = newBase + fname[old_prefix_len:]
+            if newName != fname:
+                plan.append((src, os.path.join(dirpath, newName)))
+            continue
 
-            # Normal ROM + multi-dot save files
-            if fname.startswith(oldBase + "."):
-                newName = newBase + fname[len(oldBase):]
+        # Cue track bins; the regex only runs on .bin names
+        if oldCue and fname[-4:].lower() == ".bin":
+            m = bin_match(fname)
+            if m and m.group(1) == oldCueBase:
+                track = m.group(2)
+                newName = newCueBase + track + ".bin"
                 if newName != fname:
                     plan.append((src, os.path.join(dirpath, newName)))
-                continue
-
-            # Cue track bins
-            if oldCue:
-                base, track = bin_base(fname)
-                if base == oldCueBase:
-                    newName = newCueBase + track + ".bin"
-                    if newName != fname:
-                        plan.append((src, os.path.join(dirpath, newName)))
 
     return plan
 
 # ---------- Apply renames ----------
 
+# Where supported (not on Windows), renames go through directory fds
+# opened once per directory, so the kernel resolves each directory path
+# once per batch instead of twice per rename
+_RENAME_DIR_FD = os.rename in os.supports_dir_fd and hasattr(os, "O_DIRECTORY")
+
+def _rename_at(dir_fds, src, dst):
+    """
+    os.rename(src, dst) via cached directory fds.
+    dir_fds: {directory: fd}, released with _close_dir_fds().
+    """
+    if not _RENAME_DIR_FD:
+        os.rename(src, dst)
+        return
+
+    fds = []
+    names = []
+    for path in (src, dst):
+        d, name = os.path.split(path)
+        fd = dir_fds.get(d)
+        if fd is None:
+            fd = dir_fds[d] = os.open(d or ".", os.O_RDONLY | os.O_DIRECTORY)
+        fds.append(fd)
+        names.append(name)
+
+    os.rename(names[0], names[1], src_dir_fd=fds[0], dst_dir_fd=fds[1])
+
+def _close_dir_fds(dir_fds):
+    for fd in dir_fds.values():
+        os.close(fd)
+    dir_fds.clear()
+
+_RENAME_LIST_CHECK_MIN = 16  # targets per directory before listing it pays off
+
 def apply_renames(rename_plan):
     targets = set(dst for _, dst in rename_plan)
     if len(targets) != len(rename_plan):
         raise RuntimeError("Filename collision in rename plan")
 
-    for src, dst in rename_plan:
-        if os.path.exists(dst):
-            raise RuntimeError(f"Target already exists: {dst}")
-
-    for src, dst in rename_plan:
-        os.rename(src, dst)
-
-# ---------- Save files ----------
+    # Existence pre-check. A directory receiving many targets is listed
+    # once instead of stat-ing each one; a few targets keep the stats,
+    # which beat listing a large ROM folder.
+    by_dir = defaultdict(list)
+    for _, dst in rename_plan:
+        by_dir[os.path.dirname(dst)].append(dst)
 
-def rename_save_files(old_filename, new_filename, platform=None, system=None):
-    saves_root = os.path.join(RETROARCH_DIR, "saves")
-    if not os.path.isdir(saves_root):
-        return
+    for d, dsts in by_dir.items():
+        existing = None
+        if len(dsts) >= _RENAME_LIST_CHECK_MIN:
+            try:
+                with os.scandir(d or ".") as it:
+                    existing = {os.path.normcase(e.name) for e in it}
+            except OSError:
+                existing = None
+
+        for dst in dsts:
+            if existing is None:
+                taken = os.path.exists(dst)
+            else:
+                taken = os.path.normcase(os.path.basename(dst)) in existing
+            if taken:
+                raise RuntimeError(f"Target already exists: {dst}")
 
-    oldStem = old_filename.rsplit(".", 1)[0]
-    newStem = new_filename.rsplit(".", 1)[0]
+    dir_fds = {}
+    try:
+        for src, dst in rename_plan:
+            _rename_at(dir_fds, src, dst)
+    finally:
+        _close_dir_fds(dir_fds)
 
-    roots = []
+# ---------- Associated files ----------
 
-    # --- Existing roots ---
+def _save_roots(old_filename, platform, system, isdir):
+    saves_root = os.path.join(RETROARCH_DIR, "saves")
+    if not isdir(saves_root):
+        return []
 
     # root saves dir
-    roots.append(saves_root)
+    roots = [saves_root]
 
     # platform saves
     if platform:
-        plat_dir = os.path.join(saves_root, platform)
-        if os.path.isdir(plat_dir):
-            roots.append(plat_dir)
+        roots.append(os.path.join(saves_root, platform))
 
     # core saves
     if system:
         for core in SYSTEM_TO_CORES.get(system, []):
-            core_dir = os.path.join(saves_root, core)
-            if os.path.isdir(core_dir):
-                roots.append(core_dir)
+            roots.append(os.path.join(saves_root, core))
 
     # ROM parent folder
     try:
         rom_path = find_rom_on_disk(old_filename, platform)
         if rom_path and os.path.isfile(rom_path):
             rom_parent = os.path.basename(os.path.dirname(rom_path))
-            extra_dir = os.path.join(saves_root, rom_parent)
-            if os.path.isdir(extra_dir):
-                roots.append(extra_dir)
+            roots.append(os.path.join(saves_root, rom_parent))
     except Exception:
         # Never break save renaming if ROM lookup fails
         pass
-    # -----------------------------------------
 
-    # Deduplicate roots
-    roots = list(dict.fromkeys(roots))
+    return [r for r in roots if isdir(r)]
 
-    for root in roots:
-        for dirpath, _, files in os.walk(root):
-            for fname in files:
-                base, ext = os.path.splitext(fname)
-
-                slot = ""
-                compare_base = base
-
-                # --- MemoryCard rule ---
-                if ext.lower() == ".mcr":
-                    parts = base.rsplit(".", 1)
-                    if len(parts) == 2 and parts[1].isdigit():
-                        compare_base = parts[0]
-                        slot = "." + parts[1]
-
-                if compare_base != oldStem:
-                    continue
-
-                newName = newStem + slot + ext
-
-                if newName == fname:
-                    continue
-
-                src = os.path.join(dirpath, fname)
-                dst = os.path.join(dirpath, newName)
-
-                if not os.path.exists(dst):
-                    os.rename(src, dst)
-
-# ---------- Log files ----------
-
-def rename_retroarch_logs(old_file, new_file, platform=None, system=None):
-    oldbase = os.path.splitext(old_file)[0]
-    newbase = os.path.splitext(new_file)[0]
-
-    if not os.path.isdir(RETROARCH_LOG_DIR):
-        return
+def _log_roots(platform, system, isdir):
+    if not isdir(RETROARCH_LOG_DIR):
+        return []
 
     roots = [RETROARCH_LOG_DIR]
 
     # platform logs
     if platform:
-        plat_dir = os.path.join(RETROARCH_LOG_DIR, platform)
-        if os.path.isdir(plat_dir):
-            roots.append(plat_dir)
+        roots.append(os.path.join(RETROARCH_LOG_DIR, platform))
 
     # core logs
     if system:
         for core in SYSTEM_TO_CORES.get(system, []):
-            core_dir = os.path.join(RETROARCH_LOG_DIR, core)
-            if os.path.isdir(core_dir):
-                roots.append(core_dir)
-
-    for root in roots:
-        for dirpath, _, files in os.walk(root):
-            for fname in files:
-                if fname != oldbase + ".lrtl":
-                    continue
-
-                src = os.path.join(dirpath, fname)
-                dst = os.path.join(dirpath, newbase + ".lrtl")
-
-                if not os.path.exists(dst):
-                    os.rename(src, dst)
-
-# ---------- CUE rewriting ----------
-
-def rewrite_cue_file(cue_path, oldBase, newBase):
-    lines = []
-
-    with open(cue_path, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            stripped = line.strip()
-            if stripped.upper().startswith("FILE ") and '"' in line:
-                try:
-                    prefix, rest = line.split('"', 1)
-                    filename, suffix = rest.split('"', 1)
-                    if filename.startswith(oldBase):
-                        filename = newBase + filename[len(oldBase):]
-                    line = prefix + '"' + filename + '"' + suffix
-                except:
-                    pass
-            lines.append(line)
+            roots.append(os.path.join(RETROARCH_LOG_DIR, core))
 
-    with open(cue_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    return [r for r in roots if isdir(r)]
 
-# ---------- Stem replacement ----------
+def _screenshot_root(rom_dir, old_file, new_file, isdir):
+    # RetroArch RAW screenshots live under the ROM's parent folder name
+    if not RETROARCH_SCREEN_DIR:
+        return None
 
-def replace_stem_in_file(path, oldStem, newStem):
-    with open(path, "r", encoding="utf-8", errors="ignore") as f:
-        text = f.read()
+    # Find actual ROM path to determine screenshot folder
+    rom_full_path = None
+    for entry in _iter_files(rom_dir):
+        if entry.name == new_file or entry.name == old_file:
+            rom_full_path = entry.path
+            break
 
-    if oldStem not in text:
-        return False
+    if not rom_full_path:
+        return None
 
-    text = text.replace(oldStem, newStem)
+    rom_parent = os.path.basename(os.path.dirname(rom_full_path))
+    plat_root = os.path.join(RETROARCH_SCREEN_DIR, rom_parent)
 
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+    return plat_root if isdir(plat_root) else None
 
-    return True
+# Pass order of the former per-kind helpers; the first kind that
+# matches a file decides its new name
+_ASSOCIATED_KINDS = ("saves", "logs", "retroarch", "raw", "screens")
 
-def replace_stem_in_tree(root, oldStem, newStem, exts=None):
+def rename_associated_files(rom_dir, old_file, new_file, platform=None, system=None, dir_cache=None):
     """
-    Replace filename stem matches in a directory tree using
-    tolerant RetroArch-safe matching.
+    Rename the RetroArch saves and logs, thumbnails and raw screenshots
+    that belong to a renamed ROM. Roots of every kind are collected
+    first; repeated and nested roots are folded, so each directory is
+    walked once. dir_cache memoizes isdir checks across calls.
     """
-    if not os.path.isdir(root):
-        return
+    if dir_cache is None:
+        dir_cache = {}
+
+    def isdir(path):
+        hit = dir_cache.get(path)
+        if hit is None:
+            hit = dir_cache[path] = os.path.isdir(path)
+        return hit
+
+    # Saves compare the name up to its last dot, everything else the splitext stem
+    saveStem = old_file.rsplit(".", 1)[0]
+    newSaveStem = new_file.rsplit(".", 1)[0]
+    oldStem, _ = os.path.splitext(old_file)
+    newStem, _ = os.path.splitext(new_file)
 
-    for dirpath, _, files in os.walk(root):
-        for fname in files:
-            base, ext = os.path.splitext(fname)
+    old_log = oldStem + ".lrtl"
+    new_log = newStem + ".lrtl"
 
-            if exts and ext.lower() not in exts:
-                continue
+    # Same test as filenames_equivalent(), with oldStem normalized once
+    old_norm = normalize_for_sync(oldStem)
 
-            if not filenames_equivalent(base, oldStem, strip_ext=False):
-                continue
+    roots = [(r, "saves") for r in _save_roots(old_file, platform, system, isdir)]
+    roots += [(r, "logs") for r in _log_roots(platform, system, isdir)]
 
-            newName = newStem + ext
-            if newName == fname:
-                continue
+    if platform:
+        # RetroArch thumbnails (SANITIZED)
+        if "RETROARCH_IMG_DIR" in globals():
+            ra_root = os.path.join(RETROARCH_IMG_DIR, platform)
+            if isdir(ra_root):
+                roots.append((ra_root, "retroarch"))
+
+        # Additional raw images directory (KEEP &)
+        if ADITIONAL_IMG_DIR:
+            raw_root = os.path.join(ADITIONAL_IMG_DIR, platform)
+            if isdir(raw_root):
+                roots.append((raw_root, "raw"))
+
+        # RetroArch RAW screenshots with timestamp suffix
+        # <ROM>-XXXXXX-XXXXXX.png
+        plat_root = _screenshot_root(rom_dir, old_file, new_file, isdir)
+        if plat_root:
+            roots.append((plat_root, "screens"))
+
+    if not roots:
+        return
 
-            src = os.path.join(dirpath, fname)
-            dst = os.path.join(dirpath, newName)
+    def new_name_for(kind, fname):
+        if kind == "logs":
+            return new_log if fname == old_log else None
 
-            if not os.path.exists(dst):
-                os.rename(src, dst)
+        if kind == "saves":
+            base, ext = _split_ext(fname)
+            slot = ""
 
-# ============================================================
-# ===================== MODIFY PLANNER ======================
-# ============================================================
+            # --- MemoryCard rule ---
+            if ext.lower() == ".mcr":
+                parts = base.rsplit(".", 1)
+                if len(parts) == 2 and parts[1].isdigit():
+                    base = parts[0]
+                    slot = "." + parts[1]
 
-def rename_platform_images(platform, rom_dir, old_file, new_file):
+            return newSaveStem + slot + ext if base == saveStem else None
 
-    oldStem, _ = os.path.splitext(old_file)
-    newStem, _ = os.path.splitext(new_file)
+        if kind == "screens":
+            dot = fname.rfind(".")
+            if dot <= 0 or fname[dot:].lower() not in _IMG_EXTS:
+                return None
 
-    roots = []
+            m = _RA_SHOT_STEM_TS_RE.match(fname[:dot])
+            if not m or normalize_for_sync(m.group(1)) != old_norm:
+                return None
+            return newStem + m.group(2) + fname[dot:]
 
-    # RetroArch thumbnails (SANITIZED)
-    if "RETROARCH_IMG_DIR" in globals():
-        ra_root = os.path.join(RETROARCH_IMG_DIR, platform)
-        if os.path.isdir(ra_root):
-            roots.append(("retroarch", ra_root))
+        # Thumbnails: RetroArch ones get the sanitized stem
+        base, ext = _split_ext(fname)
+        if normalize_for_sync(base) != old_norm:
+            return None
+        if kind == "retroarch":
+            return sanitize_rom_filename(newStem) + ext
+        return newStem + ext
+
+    # {normalized root: kinds}, and the top-level roots to walk
+    kinds_at = {}
+    tops = {}
+    for path, kind in roots:
+        key = os.path.normcase(os.path.abspath(path))
+        kinds_at.setdefault(key, set()).add(kind)
+        tops.setdefault(key, path)
+
+    for key in list(tops):
+        if any(key.startswith(other + os.sep) for other in kinds_at if other != key):
+            del tops[key]
+
+    # {directory: kinds in pass order}, filled as directories are met
+    dir_kinds = {}
+
+    def kinds_for(dirpath):
+        kinds = dir_kinds.get(dirpath)
+        if kinds is None:
+            d = os.path.normcase(os.path.abspath(dirpath))
+            found = set()
+            for key, ks in kinds_at.items():
+                if d == key or d.startswith(key + os.sep):
+                    found |= ks
+            kinds = dir_kinds[dirpath] = [k for k in _ASSOCIATED_KINDS if k in found]
+        return kinds
+
+    def walk_top(top):
+        # Top roots never overlap, so each walk keeps its own dir fds
+        dir_fds = {}
+        try:
+            for entry in _iter_files(top):
+                fname = entry.name
+                src = entry.path
+                dirpath = os.path.dirname(src)
+
+                for kind in kinds_for(dirpath):
+                    newName = new_name_for(kind, fname)
+                    if newName is None:
+                        continue
 
-    # Additional raw images directory (KEEP &)
-    if ADITIONAL_IMG_DIR:
-        raw_root = os.path.join(ADITIONAL_IMG_DIR, platform)
-        if os.path.isdir(raw_root):
-            roots.append(("raw", raw_root))
+                    if newName != fname:
+                        dst = os.path.join(dirpath, newName)
+                        if not os.path.exists(dst):
+                            _rename_at(dir_fds, src, dst)
+                    break
+        finally:
+            _close_dir_fds(dir_fds)
+
+    # Saves, logs, thumbnails and screenshots usually sit in separate
+    # trees; walk them side by side
+    if len(tops) > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, len(tops))) as ex:
+            list(ex.map(walk_top, tops.values()))
+    else:
+        for top in tops.values():
+            walk_top(top)
 
-    for kind, root in roots:
-        if kind == "retroarch":
-            targetStem = sanitize_rom_filename(newStem)
-        else:
-            targetStem = newStem
+# ---------- CUE rewriting ----------
 
-        for dirpath, _, files in os.walk(root):
-            for fname in files:
-                base, ext = os.path.splitext(fname)
+def rewrite_cue_file(cue_path, oldBase, newBase):
+    # Stream into a temp file next to the cue, then swap it in;
+    # a cue with nothing to rewrite is left alone
+    def fill(tmp):
+        changed = False
+        for line in src:
+            # Only the first five chars need upper-casing, not the line
+            if line.lstrip()[:5].upper() == "FILE " and '"' in line:
+                try:
+                    prefix, rest = line.split('"', 1)
+                    filename, suffix = rest.split('"', 1)
+                    if filename.startswith(oldBase):
+                        filename = newBase + filename[len(oldBase):]
+                        changed = True
+                    line = prefix + '"' + filename + '"' + suffix
+                except:
+                    pass
+            tmp.write(line)
+        return changed
 
-                if not filenames_equivalent(base, oldStem, strip_ext=False):
-                    continue
+    with open(cue_path, "r", encoding="utf-8", errors="ignore") as src:
+        _write_via_temp(cue_path, fill, "w", encoding="utf-8")
 
-                newName = targetStem + ext
-                if newName == fname:
-                    continue
+# ---------- Stem replacement ----------
 
-                src = os.path.join(dirpath, fname)
-                dst = os.path.join(dirpath, newName)
+_STEM_MMAP_MIN = 64 * 1024  # below this a plain read is cheaper than mapping
 
-                if not os.path.exists(dst):
-                    os.rename(src, dst)
+def replace_stem_in_file(path, oldStem, newStem):
+    # Large files: look for the raw bytes first, so a file without
+    # the stem is never decoded
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return False
+        if size >= _STEM_MMAP_MIN:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(oldStem.encode("utf-8")) < 0:
+                    return False
 
-    # --------------------------------------------------
-    # RetroArch RAW screenshots with timestamp suffix
-    # <ROM>-XXXXXX-XXXXXX.png
-    # --------------------------------------------------
-    if not RETROARCH_SCREEN_DIR:
-        return
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        text = f.read()
 
-    # Find actual ROM path to determine screenshot folder
-    rom_full_path = None
-    for r, _, files in os.walk(rom_dir):
-        if new_file in files or old_file in files:
-            rom_full_path = os.path.join(r, new_file if new_file in files else old_file)
-            break
+    if oldStem not in text:
+        return False
 
-    if not rom_full_path:
-        return
+    text = text.replace(oldStem, newStem)
 
-    rom_parent = os.path.basename(os.path.dirname(rom_full_path))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
 
-    plat_root = os.path.join(RETROARCH_SCREEN_DIR, rom_parent)
+    return True
 
-    if not os.path.isdir(plat_root):
+def replace_stem_in_tree(root, oldStem, newStem, exts=None):
+    """
+    Replace filename stem matches in a directory tree using
+    tolerant RetroArch-safe matching.
+    """
+    if not os.path.isdir(root):
         return
 
+    # Same test as filenames_equivalent(), with oldStem normalized once
+    old_norm = normalize_for_sync(oldStem)
+    exts = frozenset(e.lower() for e in exts) if exts else None
 
-    ts_re = re.compile(r"^(.*?)(-\d{6}-\d{6})$")
-
-    for dirpath, _, files in os.walk(plat_root):
-        for fname in files:
-            base, ext = os.path.splitext(fname)
-            if ext.lower() not in (".png", ".jpg", ".jpeg"):
-                continue
+    dir_fds = {}
+    try:
+        for entry in _iter_files(root):
+            fname = entry.name
+            base, ext = _split_ext(fname)
 
-            m = ts_re.match(base)
-            if not m:
+            if exts is not None and ext.lower() not in exts:
                 continue
 
-            stem, ts = m.groups()
-
-            if not filenames_equivalent(stem, oldStem, strip_ext=False):
+            if normalize_for_sync(base) != old_norm:
                 continue
 
-            newName = newStem + ts + ext
+            newName = newStem + ext
             if newName == fname:
                 continue
 
-            src = os.path.join(dirpath, fname)
-            dst = os.path.join(dirpath, newName)
+            src = entry.path
+            dst = os.path.join(os.path.dirname(src), newName)
 
             if not os.path.exists(dst):
-                os.rename(src, dst)
+                _rename_at(dir_fds, src, dst)
+    finally:
+        _close_dir_fds(dir_fds)
+
+# ============================================================
+# ===================== MODIFY PLANNER ======================
+# ============================================================
+
+def rename_processed_idents(proc_lines, renames):
+    """
+    Apply (platform, old_base, new_base) renames, in order, to the ident
+    prefix of processedscreens.txt lines in a single pass.
+    Returns (lines, changed).
+    """
+    if not renames:
+        return proc_lines, False
+
+    by_plat = defaultdict(list)
+    for plat, old_base, new_base in renames:
+        by_plat[plat].append((old_base, new_base))
+
+    # {plat: ({old_base}, (distinct lengths, longest first))}: most idents
+    # match no rename, and a few slices + set lookups tell them apart
+    prefixes = {
+        plat: (
+            {old for old, _ in pairs},
+            sorted({len(old) for old, _ in pairs}, reverse=True),
+        )
+        for plat, pairs in by_plat.items()
+    }
+
+    out = []
+    changed = False
+    for line in proc_lines:
+        try:
+            plat, target, ident, ts = line.split("|", 3)
+        except ValueError:
+            # preserve malformed/unknown lines unchanged
+            out.append(line)
+            continue
+
+        hit = prefixes.get(plat)
+        if hit and any(ident[:n] in hit[0] for n in hit[1]):
+            # Matched: replay the renames in order so chains still apply
+            for old_base, new_base in by_plat[plat]:
+                if ident.startswith(old_base):
+                    ident = new_base + ident[len(old_base):]
+                    changed = True
+
+        out.append(f"{plat}|{target}|{ident}|{ts}")
+
+    return out, changed
 
 def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
     def parse(row):
@@ -2908,21 +3861,29 @@ def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
     # build local map (robust: tolerate malformed lines)
     local_map = {}
     for r in local_rows:
-        parts = [x.strip() for x in r.split("|", 3)]
+        parts = r.split("|", 3)
         if len(parts) < 4:
             # skip malformed local row
             continue
-        p, t, g, f = parts[:4]
-        local_map[(p, t, g, f)] = r
-
-    # build playtime map (skip malformed play rows)
+        p, t, g, f = parts
+        local_map[(p.strip(), t.strip(), g.strip(), f.strip())] = r
+
+    # {(normalized platform, title, gameid): first local key}, so each
+    # edited row is an O(1) identity lookup instead of a full scan
+    local_by_identity = {}
+    for key in local_map:
+        p, t, g, _ = key
+        local_by_identity.setdefault((normalize_platform_for_identity(p), t, g), key)
+
+    # build playtime map (skip malformed play rows);
+    # keeps the parsed playtime so rows are split only once
     play_map = {}
     for r in play_rows:
-        try:
-            p, t, g, pt, lp, f = parse(r)
-        except ValueError:
+        parts = r.split("|")
+        if len(parts) != 6:
             continue
-        play_map[(p, t, g, f)] = r
+        p, t, g, pt, lp, f = map(str.strip, parts)
+        play_map[(p, t, g, f)] = (r, pt, lp)
 
     replacements_local = {}
     replacements_play  = {}
@@ -2933,12 +3894,9 @@ def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
     # processed screenshots registry
     # --------------------------------------------------
     proc_file = os.path.join(os.path.dirname(__file__), "processedscreens.txt")
-    proc_lines = []
-    if os.path.isfile(proc_file):
-        with open(proc_file, "r", encoding="utf-8") as f:
-            proc_lines = [l.rstrip("\n") for l in f]
 
-    proc_updated = False
+    # (platform, old_base, new_base), applied in one pass after the loop
+    proc_renames = []
 
     for old, new in zip(old_lines, new_lines):
         op, ot, og, opt, olp, of = parse(old)
@@ -2952,20 +3910,9 @@ def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
             )
 
         # find current row by identity only
-        identity_match = None
-        for (p, t, g, f), row in local_map.items():
-            if (
-                normalize_platform_for_identity(p),
-                t,
-                g
-            ) == (
-                normalize_platform_for_identity(op),
-                ot,
-                og
-            ):
-                identity_match = (p, t, g, f)
-                break
-
+        identity_match = local_by_identity.get(
+            (normalize_platform_for_identity(op), ot, og)
+        )
 
         if not identity_match:
             raise RuntimeError(
@@ -2999,10 +3946,9 @@ def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
         # --------------------------------------------------
         # playtime_export.txt
         # --------------------------------------------------
-        old_play = play_map.get(current_key)
+        old_play, pt, lp = play_map.get(current_key, (None, None, None))
         if old_play:
             if not npt and not nlp:
-                _, _, _, pt, lp, _ = parse(old_play)
                 npt, nlp = pt, lp
 
             replacements_play[old_play] = (
@@ -3031,22 +3977,7 @@ def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
             old_base = os.path.splitext(of)[0]
             new_base = os.path.splitext(nf)[0]
 
-            new_proc = []
-            for line in proc_lines:
-                try:
-                    plat, target, ident, ts = line.split("|", 3)
-                except:
-                    # preserve malformed/unknown lines unchanged
-                    new_proc.append(line)
-                    continue
-
-                if plat == op and ident.startswith(old_base):
-                    ident = new_base + ident[len(old_base):]
-                    proc_updated = True
-
-                new_proc.append(f"{plat}|{target}|{ident}|{ts}")
-
-            proc_lines = new_proc
+            proc_renames.append((op, old_base, new_base))
 
         # --------------------------------------------------
         # Playtime propagation
@@ -3058,10 +3989,16 @@ def build_modify_plans(old_lines, new_lines, local_rows, play_rows):
     # --------------------------------------------------
     # Write processed screen updates
     # --------------------------------------------------
-    if proc_updated:
-        with open(proc_file, "w", encoding="utf-8") as f:
-            for l in proc_lines:
-                f.write(l + "\n")
+    # Only read (and rewrite) the registry when a rename can touch it
+    if proc_renames and os.path.isfile(proc_file):
+        with open(proc_file, "r", encoding="utf-8") as f:
+            proc_lines = [l.rstrip("\n") for l in f]
+
+        proc_lines, proc_updated = rename_processed_idents(proc_lines, proc_renames)
+        if proc_updated:
+            write_file_atomic(
+                proc_file, "".join(l + "\n" for l in proc_lines).encode("utf-8")
+            )
 
     return replacements_local, replacements_play, rename_jobs, time_jobs, []
 
@@ -3092,52 +4029,43 @@ def run_modify_direct(old_lines, new_lines):
     # processedscreens.txt
     # ----------------------------------
     proc_file = os.path.join(os.path.dirname(__file__), "processedscreens.txt")
-    proc_lines = []
 
-    if os.path.isfile(proc_file):
+    if processed_renames and os.path.isfile(proc_file):
         with open(proc_file, "r", encoding="utf-8") as f:
             proc_lines = [l.rstrip("\n") for l in f]
 
-    if proc_lines and processed_renames:
-        new_proc = []
-
-        for line in proc_lines:
-            try:
-                plat, target, ident, ts = line.split("|", 3)
-            except:
-                new_proc.append(line)
-                continue
-
-            for p, oldf, newf in processed_renames:
-                if plat != p:
-                    continue
-
-                old_base = os.path.splitext(oldf)[0]
-                new_base = os.path.splitext(newf)[0]
-
-                if ident.startswith(old_base):
-                    ident = new_base + ident[len(old_base):]
-
-            new_proc.append(f"{plat}|{target}|{ident}|{ts}")
+        new_proc, changed = rename_processed_idents(
+            proc_lines,
+            [
+                (p, os.path.splitext(oldf)[0], os.path.splitext(newf)[0])
+                for p, oldf, newf in processed_renames
+            ],
+        )
 
-        with open(proc_file, "w", encoding="utf-8") as f:
-            for l in new_proc:
-                f.write(l + "\n")
+        # Untouched registry: no rewrite
+        if changed:
+            write_file_atomic(
+                proc_file, "".join(l + "\n" for l in new_proc).encode("utf-8")
+            )
 
     # ----------------------------------
     # Playtime propagation
     # ----------------------------------
-    for platform, gameid, filename, seconds, lastplayed in time_jobs:
-        write_retroarch_time(filename, seconds, lastplayed)
-        write_launchbox_time(platform, gameid, filename, seconds, lastplayed)
+    try:
+        for platform, gameid, filename, seconds, lastplayed in time_jobs:
+            write_retroarch_time(filename, seconds, lastplayed)
+            write_launchbox_time(platform, gameid, filename, seconds, lastplayed)
 
-        system = PLATFORM_TO_SYSTEM.get(platform)
+            system = PLATFORM_TO_SYSTEM.get(platform)
 
-        if use_standalone_emulator(system):
-            if system in ("GC", "WII"):
-                write_dolphin_time(gameid, seconds)
-            if system == "PS2":
-                write_pcsx2_time(gameid, seconds, lastplayed)
+            if use_standalone_emulator(system):
+                if system in ("GC", "WII"):
+                    write_dolphin_time(gameid, seconds)
+                if system == "PS2":
+                    write_pcsx2_time(gameid, seconds, lastplayed)
+    finally:
+        # Even after a failed write: keep what was applied, drop the cached state
+        flush_pcsx2()
 
 # ============================================================
 # ===================== COMMAND ENGINE ======================
@@ -3216,6 +4144,78 @@ def cmd_check_paths():
 
 # ---------- Change Retroarch labels ----------
 
+def _iter_playlists():
+    """
+    Yield (file name, path) for every .lpl file in the RetroArch playlist folder.
+    """
+    with os.scandir(RETROARCH_PLAYLIST_DIR) as it:
+        for entry in it:
+            if entry.name.lower().endswith(".lpl") and entry.is_file():
+                yield entry.name, entry.path
+
+def _iter_playlist_items(path):
+    """
+    Yield the entries of a playlist's "items" array, one at a time
+    when ijson is available.
+    """
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "items.item")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f).get("items", [])
+
+def _relabel_playlist(path, new_label_for):
+    """
+    Set each entry's label to new_label_for(item) (None = leave it) and
+    rewrite the playlist if anything changed. Returns the number of labels changed.
+    """
+    def pending(item):
+        # The label to write, or None when the entry is already right
+        new_label = new_label_for(item)
+        if new_label is None or item.get("label") == new_label:
+            return None
+        return new_label
+
+    try:
+        # Dry scan first: untouched playlists never get a full load
+        if ijson is not None and all(pending(item) is None for item in _iter_playlist_items(path)):
+            return 0
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except:
+        return 0
+
+    changed = 0
+
+    for item in data.get("items", []):
+        new_label = pending(item)
+        if new_label is not None:
+            item["label"] = new_label
+            changed += 1
+
+    if changed:
+        # json.dump() would issue one write per encoder chunk; build the text first
+        text = json.dumps(data, indent=2, separators=(",", ": "), ensure_ascii=False)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    return changed
+
+def _map_playlists(fn, jobs):
+    """
+    Run fn(*job) for every playlist job side by side (playlists are
+    independent files) and return the results in job order.
+    """
+    if len(jobs) < 2:
+        return [fn(*job) for job in jobs]
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(jobs))) as ex:
+        return list(ex.map(lambda job: fn(*job), jobs))
+
+# Backups are JSON lines; older ones used <playlist>, "crc32": "<crc>", "label": "<label>"
+_LABEL_BACKUP_RE = re.compile(r'^([^,]+),\s*"crc32":\s*"([^"]*)",\s*"label":\s*"(.*)"\s*$')
+
 def backup_retroarch_labels():
     """
     Create a timestamped backup of all RetroArch playlist labels.
@@ -3231,34 +4231,34 @@ def backup_retroarch_labels():
     stamp = datetime.datetime.now().strftime("%Y_%m_%d-%H_%M_%S")
     out_file = os.path.join(backup_dir, f"label_backup_{stamp}.txt")
 
-    lines = []
+    def playlist_lines(fname, path):
+        found = []
 
-    for fname in sorted(os.listdir(RETROARCH_PLAYLIST_DIR)):
-        if not fname.lower().endswith(".lpl"):
-            continue
+        try:
+            for entry in _iter_playlist_items(path):
+                crc = entry.get("crc32", "").strip()
+                label = entry.get("label", "").strip()
 
-        path = os.path.join(RETROARCH_PLAYLIST_DIR, fname)
+                if not crc or not label:
+                    continue
 
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                found.append(json.dumps(
+                    {"playlist": fname, "crc32": crc, "label": label},
+                    ensure_ascii=False,
+                ))
         except:
-            continue
-
-        for entry in data.get("items", []):
-            crc = entry.get("crc32", "").strip()
-            label = entry.get("label", "").strip()
+            return []
 
-            if not crc or not label:
-                continue
+        return found
 
-            lines.append(
-                f'{fname}, "crc32": "{crc}", "label": "{label}"'
-            )
+    lines = [
+        line
+        for found in _map_playlists(playlist_lines, sorted(_iter_playlists()))
+        for line in found
+    ]
 
     with open(out_file, "w", encoding="utf-8") as f:
-        for line in lines:
-            f.write(line + "\n")
+        f.writelines(line + "\n" for line in lines)
 
     return out_file
     
@@ -3285,46 +4285,36 @@ def restore_labels_from_oldest_backup():
 
     oldest = os.path.join(backup_dir, backups[0])
 
-    restore_map = {}  # (playlist, crc32) -> label
+    restore_map = {}  # playlist -> {crc32: label}
 
     with open(oldest, "r", encoding="utf-8") as f:
         for line in f:
-            try:
-                playlist, rest = line.split(",", 1)
-                crc = rest.split('"crc32": "')[1].split('"')[0]
-                label = rest.split('"label": "')[1].rsplit('"', 1)[0]
-                restore_map[(playlist.strip(), crc.strip())] = label
-            except:
+            if line.startswith("{"):
+                try:
+                    rec = json.loads(line)
+                    restore_map.setdefault(rec["playlist"], {})[rec["crc32"]] = rec["label"]
+                except (ValueError, KeyError, TypeError):
+                    pass
                 continue
 
-    restored = 0
-
-    for fname in os.listdir(RETROARCH_PLAYLIST_DIR):
-        if not fname.lower().endswith(".lpl"):
-            continue
-
-        path = os.path.join(RETROARCH_PLAYLIST_DIR, fname)
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except:
-            continue
+            # Legacy backup line
+            m = _LABEL_BACKUP_RE.match(line)
+            if not m:
+                continue
+            playlist, crc, label = m.groups()
+            restore_map.setdefault(playlist.strip(), {})[crc.strip()] = label
 
-        changed = False
+    def new_label_for(labels, item):
+        return labels.get(item.get("crc32", "").strip())
 
-        for item in data.get("items", []):
-            key = (fname, item.get("crc32", "").strip())
-            if key in restore_map:
-                new_label = restore_map[key]
-                if item.get("label") != new_label:
-                    item["label"] = new_label
-                    changed = True
-                    restored += 1
+    # Playlists with nothing in the backup are never opened
+    jobs = [
+        (path, functools.partial(new_label_for, restore_map[fname]))
+        for fname, path in _iter_playlists()
+        if restore_map.get(fname)
+    ]
 
-        if changed:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    restored = sum(_map_playlists(_relabel_playlist, jobs))
 
     print(f"Restored {restored} labels from backup: {backups[0]}")
 
@@ -3336,67 +4326,39 @@ def set_labels_to_rom_filename():
     - Arcade platforms always use database title
     - 3DS strips ".standard"
     """
-    db = {}
-
-    # Load database map (filename → title)
-    try:
-        with open("local_games.txt", "r", encoding="utf-8") as f:
-            for line in f:
-                parts = [p.strip() for p in line.split("|")]
-                if len(parts) != 4:
-                    continue
-                title = parts[1]
-                filename = parts[3]
-                db[filename] = title
-    except:
+    # Database map (filename → title)
+    db = load_local_titles()
+    if db is None:
         print("local_games.txt not found.")
         return
 
-    updated = 0
-
-    for playlist in os.listdir(RETROARCH_PLAYLIST_DIR):
-        if not playlist.lower().endswith(".lpl"):
-            continue
-
-        playlist_name = os.path.splitext(playlist)[0]
-        path = os.path.join(RETROARCH_PLAYLIST_DIR, playlist)
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except:
-            continue
+    def new_label_for(is_arcade, is_3ds, item):
+        rom_path = item.get("path", "").strip()
+        if not rom_path:
+            return None
 
-        changed = False
-        is_arcade = playlist_name in ARCADE_PLATFORMS
-        is_3ds = "3ds" in playlist_name.lower()
+        filename = os.path.basename(rom_path)
 
-        for item in data.get("items", []):
-            rom_path = item.get("path", "").strip()
-            if not rom_path:
-                continue
+        # Arcade → force DB title
+        if is_arcade and filename in db:
+            return db[filename]
 
-            filename = os.path.basename(rom_path)
+        stem = os.path.splitext(filename)[0]
 
-            # Arcade → force DB title
-            if is_arcade and filename in db:
-                new_label = db[filename]
-            else:
-                stem = os.path.splitext(filename)[0]
+        if is_3ds and stem.endswith(".standard"):
+            stem = stem[:-9]
 
-                if is_3ds and stem.endswith(".standard"):
-                    stem = stem[:-9]
+        return stem
 
-                new_label = stem
+    jobs = []
 
-            if item.get("label") != new_label:
-                item["label"] = new_label
-                changed = True
-                updated += 1
+    for playlist, path in _iter_playlists():
+        playlist_name = _split_ext(playlist)[0]
+        is_arcade = playlist_name in ARCADE_PLATFORMS
+        is_3ds = "3ds" in playlist_name.lower()
+        jobs.append((path, functools.partial(new_label_for, is_arcade, is_3ds)))
 
-        if changed:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    updated = sum(_map_playlists(_relabel_playlist, jobs))
 
     print(f"Updated {updated} labels to ROM filenames.")
 
@@ -3405,60 +4367,21 @@ def set_labels_to_database_titles():
     Set RetroArch playlist labels using local_games.txt database titles.
     Matches by filename.
     """
-    db = {}
-
-    # Build filename → title map
-    try:
-        with open("local_games.txt", "r", encoding="utf-8") as f:
-            for line in f:
-                parts = [p.strip() for p in line.split("|")]
-                if len(parts) != 4:
-                    continue
-
-                title = parts[1]
-                filename = parts[3]
-
-                db[filename] = title
-    except:
+    # Filename → title map
+    db = load_local_titles()
+    if db is None:
         print("local_games.txt not found.")
         return
 
-    updated = 0
-
-    for fname in os.listdir(RETROARCH_PLAYLIST_DIR):
-        if not fname.lower().endswith(".lpl"):
-            continue
-
-        path = os.path.join(RETROARCH_PLAYLIST_DIR, fname)
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except:
-            continue
-
-        changed = False
-
-        for item in data.get("items", []):
-            rom_path = item.get("path", "").strip()
-            if not rom_path:
-                continue
-
-            filename = os.path.basename(rom_path)
-
-            if filename not in db:
-                continue
-
-            new_label = db[filename]
+    def new_label_for(item):
+        rom_path = item.get("path", "").strip()
+        if not rom_path:
+            return None
 
-            if item.get("label") != new_label:
-                item["label"] = new_label
-                changed = True
-                updated += 1
+        return db.get(os.path.basename(rom_path))
 
-        if changed:
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+    jobs = [(path, new_label_for) for _, path in _iter_playlists()]
+    updated = sum(_map_playlists(_relabel_playlist, jobs))
 
     print(f"Updated {updated} labels from database.")
 
@@ -3544,8 +4467,7 @@ def cmd_export_playtime():
 
         # ---------- RetroArch ----------
         if rom_stem in ra:
-            seconds = ra[rom_stem].get("seconds", 0)
-            lp = ra[rom_stem].get("last_played", "")
+            seconds, lp = ra[rom_stem]
             if lp:
                 last_played = lp
 
@@ -3770,6 +4692,20 @@ def cmd_sync():
 
 # ---------- Link pictures ----------
 
+# A trailing -NN or a [..]/(..) tag; these go before the article pass
+# so its word boundaries see the text without them
+_LINK_TAG_RE = re.compile(r"-\d{2}$|[\[\(].*?[\]\)]")
+_LINK_STRIP_RE = re.compile(r"\b(?:the|die|les)\b|[.,\-_\&:\[\]\(\)\s]")
+
+@functools.lru_cache(maxsize=65536)
+def normalize_text(s):
+    # Plain ASCII has nothing to decompose; skip the per-char pass
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s)
+        s = "".join(c for c in s if not unicodedata.combining(c))
+    s = _LINK_TAG_RE.sub("", s).lower()
+    return _LINK_STRIP_RE.sub("", s)
+
 def cmd_link_pictures():
     print("\nLink pictures to Retroarch and Launchbox\n")
 
@@ -3781,9 +4717,8 @@ def cmd_link_pictures():
         ("Exit", None, None),
     ]
 
-    VALID_IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+    VALID_IMAGE_EXTS = frozenset((".png", ".jpg", ".jpeg", ".bmp", ".webp"))
     dash2_re = re.compile(r"-\d{2}$")
-    tag_re = re.compile(r"[\[\(].*?[\]\)]")
 
     print("Select image source:")
     for i, (name, path, _) in enumerate(options, 1):
@@ -3827,31 +4762,17 @@ def cmd_link_pictures():
             continue
 
         try:
-            tree = ET.parse(path)
-            root = tree.getroot()
+            for g in iter_launchbox_games(path):
+                app = g.findtext("ApplicationPath", "").strip()
+                title = g.findtext("Title", "").strip()
+                if not app or not title:
+                    continue
+
+                stem = os.path.splitext(os.path.basename(app))[0]
+                lb_title_map.setdefault(plat, {})[stem] = title
         except:
             continue
 
-        for g in root.findall("Game"):
-            app = g.findtext("ApplicationPath", "").strip()
-            title = g.findtext("Title", "").strip()
-            if not app or not title:
-                continue
-
-            stem = os.path.splitext(os.path.basename(app))[0]
-            lb_title_map.setdefault(plat, {})[stem] = title
-
-    def normalize_text(s):
-        s = unicodedata.normalize("NFKD", s)
-        s = "".join(c for c in s if not unicodedata.combining(c))
-        s = dash2_re.sub("", s)
-        s = tag_re.sub("", s)
-        s = s.lower()
-        for article in ("the", "die", "les"):
-            s = re.sub(rf"\b{article}\b", "", s)
-        s = re.sub(r"[.,\-_\&:\[\]\(\)\s]", "", s)
-        return s
-
     title_to_stem = {}
     for platform, m in lb_title_map.items():
         rev = {}
@@ -3903,49 +4824,54 @@ def cmd_link_pictures():
                 if not img_dir or not os.path.isdir(img_dir):
                     continue
 
-                files = [
-                    f for f in os.listdir(img_dir)
-                    if os.path.splitext(f)[1].lower() in VALID_IMAGE_EXTS
-                ]
-
-                file_bases = {os.path.splitext(f)[0]: f for f in files}
+                # One scandir pass collects the images and their stems
+                files = []  # (file name, stem)
+                file_bases = {}
+                with os.scandir(img_dir) as it:
+                    for entry in it:
+                        base, ext = _split_ext(entry.name)
+                        if ext.lower() in VALID_IMAGE_EXTS and entry.is_file():
+                            files.append((entry.name, base))
+                            file_bases[base] = entry.name
                 pool = titles if is_launchbox else rom_stems
 
-                reserved_bases = set()
-                for item in pool:
-                    exact_names = (
+                pool_names = [
+                    (item, (
                         {item, item.replace("'", "_"), item.replace(":", "_"), item.replace("/", "_")}
                         if is_launchbox else
                         {item, item.replace("&", "_")}
-                    )
-                    for base in file_bases:
-                        if dash2_re.sub("", base) in exact_names:
-                            reserved_bases.add(base)
+                    ))
+                    for item in pool
+                ]
 
-                for item in pool:
-                    exact_names = (
-                        {item, item.replace("'", "_"), item.replace(":", "_"), item.replace("/", "_")}
-                        if is_launchbox else
-                        {item, item.replace("&", "_")}
-                    )
-                    if any(
-                        dash2_re.sub("", b) in exact_names if is_launchbox else b in exact_names
-                        for b in reserved_bases
-                    ):
+                # Images already named exactly after some title/ROM are left alone
+                all_exact = set().union(*(names for _, names in pool_names))
+                reserved_bases = {
+                    base for base in file_bases
+                    if dash2_re.sub("", base) in all_exact
+                }
+                reserved_keys = (
+                    {dash2_re.sub("", b) for b in reserved_bases}
+                    if is_launchbox else reserved_bases
+                )
+
+                # Normalized stem (with and without -NN) → images, in listing order
+                by_norm = {}
+                for f, base in files:
+                    if base in reserved_bases:
+                        continue
+                    norm = normalize_text(base)
+                    by_norm.setdefault(norm, []).append(f)
+                    norm_no_dash2 = normalize_text(dash2_re.sub("", base))
+                    if norm_no_dash2 != norm:
+                        by_norm.setdefault(norm_no_dash2, []).append(f)
+
+                for item, exact_names in pool_names:
+                    if not exact_names.isdisjoint(reserved_keys):
                         continue
 
                     item_norm = normalize_text(item)
-                    matches = []
-
-                    for f in files:
-                        base = os.path.splitext(f)[0]
-                        if base in reserved_bases:
-                            continue
-                        if (
-                            normalize_text(base) == item_norm or
-                            normalize_text(dash2_re.sub("", base)) == item_norm
-                        ):
-                            matches.append(f)
+                    matches = by_norm.get(item_norm, ())
 
                     if len(matches) != 1:
                         continue
@@ -3990,9 +4916,13 @@ def cmd_link_pictures():
         print("Cancelled.")
         return
 
-    for src, dst in planned_jobs:
-        if not os.path.exists(dst):
-            os.rename(src, dst)
+    dir_fds = {}
+    try:
+        for src, dst in planned_jobs:
+            if not os.path.exists(dst):
+                _rename_at(dir_fds, src, dst)
+    finally:
+        _close_dir_fds(dir_fds)
 
     print(f"Applied {len(planned_jobs)} renames.")
 
@@ -4268,22 +5198,33 @@ def cmd_sync_screenshots():
 # ---------- Modify ----------
 
 def apply_rename_jobs(rename_jobs):
+    # isdir results for candidate roots, shared by all jobs
+    dir_cache = {}
+
+    # {rom_dir: (platform, system)}: jobs of a bulk edit share a few dirs
+    platform_cache = {}
+
     for rom_dir, old_file, new_file in rename_jobs:
         # ----------------------------------
         # Resolve platform robustly
         # ----------------------------------
-        platform = None
-        cur = rom_dir
-
-        # Walk upwards until we find a known platform folder
-        while cur and cur != os.path.dirname(cur):
-            name = os.path.basename(cur)
-            if name in PLATFORM_TO_SYSTEM:
-                platform = name
-                break
-            cur = os.path.dirname(cur)
+        cached = platform_cache.get(rom_dir)
+        if cached is None:
+            platform = None
+            cur = rom_dir
+
+            # Walk upwards until we find a known platform folder
+            while cur and cur != os.path.dirname(cur):
+                name = os.path.basename(cur)
+                if name in PLATFORM_TO_SYSTEM:
+                    platform = name
+                    break
+                cur = os.path.dirname(cur)
+
+            system = PLATFORM_TO_SYSTEM.get(platform) if platform else None
+            cached = platform_cache[rom_dir] = (platform, system)
 
-        system = PLATFORM_TO_SYSTEM.get(platform) if platform else None
+        platform, system = cached
 
         # ----------------------------------
         # ROM files
@@ -4292,26 +5233,28 @@ def apply_rename_jobs(rename_jobs):
         apply_renames(plan)
 
         # ----------------------------------
-        # RetroArch saves & logs (scoped helpers)
+        # RetroArch saves & logs, platform images
+        # (thumbnails / screenshots), in one walk
         # ----------------------------------
-        rename_save_files(old_file, new_file, platform, system)
-        rename_retroarch_logs(old_file, new_file, platform, system)
-
-        # ----------------------------------
-        # Platform images (thumbnails / screenshots)
-        # ----------------------------------
-        if platform:
-            rename_platform_images(platform, rom_dir, old_file, new_file)
+        rename_associated_files(
+            rom_dir, old_file, new_file, platform, system, dir_cache=dir_cache
+        )
 
         # ----------------------------------
         # CUE → BIN handling
         # ----------------------------------
         if old_file.lower().endswith(".cue"):
-            cue_path = None
-            for dirpath, _, files in os.walk(rom_dir):
-                if new_file in files:
-                    cue_path = os.path.join(dirpath, new_file)
-                    break
+            # The rename plan already knows where the cue landed;
+            # only walk the ROM tree again if it wasn't part of it
+            cue_path = next(
+                (dst for _, dst in plan if os.path.basename(dst) == new_file),
+                None,
+            )
+            if cue_path is None:
+                for entry in _iter_files(rom_dir):
+                    if entry.name == new_file:
+                        cue_path = entry.path
+                        break
 
             if cue_path:
                 try:
@@ -4349,15 +5292,16 @@ def apply_rename_jobs(rename_jobs):
 
                     changed = False
 
-                    for g in root.findall("Game"):
-                        app = g.findtext("ApplicationPath", "")
+                    for g in root.iterfind("Game"):
+                        el = g.find("ApplicationPath")
+                        app = el.text if el is not None else None
                         if not app:
                             continue
 
                         if os.path.basename(app) != old_file:
                             continue
 
-                        g.find("ApplicationPath").text = os.path.join(
+                        el.text = os.path.join(
                             os.path.dirname(app),
                             new_file
                         )
@@ -4384,7 +5328,7 @@ def is_disc_tag_removed(old_file, new_file):
     Return True if old_file has a disc tag and new_file does not.
     """
     def has_disc(name):
-        return re.search(r"\b(disc|disk|cd)\s*\d+\b", name, re.I) is not None
+        return DISC_RE.search(name) is not None
 
     return has_disc(old_file) and not has_disc(new_file)
 
@@ -4456,17 +5400,21 @@ def cmd_modify(arg=None):
 
         apply_rename_jobs(rename_jobs)
 
-        for platform, gameid, filename, seconds, lastplayed in time_jobs:
-            write_retroarch_time(filename, seconds, lastplayed)
-            write_launchbox_time(platform, gameid, filename, seconds, lastplayed)
+        try:
+            for platform, gameid, filename, seconds, lastplayed in time_jobs:
+                write_retroarch_time(filename, seconds, lastplayed)
+                write_launchbox_time(platform, gameid, filename, seconds, lastplayed)
 
-            system = PLATFORM_TO_SYSTEM.get(platform)
+                system = PLATFORM_TO_SYSTEM.get(platform)
 
-            if system in ("GC", "WII"):
-                write_dolphin_time(gameid, seconds)
+                if system in ("GC", "WII"):
+                    write_dolphin_time(gameid, seconds)
 
-            if system == "PS2":
-                write_pcsx2_time(gameid, seconds, lastplayed)
+                if system == "PS2":
+                    write_pcsx2_time(gameid, seconds, lastplayed)
+        finally:
+            # Even after a failed write: keep what was applied, drop the cached state
+            flush_pcsx2()
 
         replace_lines_in_file(LOCAL_DB, replacements_local)
         replace_lines_in_file(PLAYTIME_EXPORT, replacements_play)
@@ -4520,8 +5468,7 @@ def cmd_revert(arg=None):
     lines[target - 1] = f"{idx}. {new} → {old}"
 
     with open(HISTORY, "w", encoding="utf-8") as f:
-        for l in lines:
-            f.write(l + "\n")
+        f.writelines(l + "\n" for l in lines)
 
     print("Revert complete.")
 